@@ -3,24 +3,39 @@
 
 from __future__ import annotations
 
+import atexit
+import contextlib
+import copy
+import functools
+import hashlib
 import html
 import json
 import mimetypes
 import os
 import pathlib
+import queue
 import re
+import shutil
 import sqlite3
 import subprocess
 import threading
 import time
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import parse_qs, quote, unquote, urlparse
 
 import requests
 import yaml
-from flask import Flask, Response, jsonify, render_template, request, stream_with_context
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from flask import Flask, Response, g, has_request_context, jsonify, render_template, request, stream_with_context
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None  # type: ignore[assignment]
 
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
@@ -38,7 +53,8 @@ WORKFLOW_PATH = ROOT / ".github" / "workflows" / "phase5_story3_trigger.yml"
 PAYLOAD_CONFIG_PATH = ROOT / "tools" / "config" / "script_3_hoodrat_payload.json"
 DEFAULT_SCRIPT_PATH = ROOT / "tools" / "config" / "script_3_voiceover.md"
 
-PYTHON_BIN = os.environ.get("PYTHON", "python3")
+# Resolved once so each trigger launch skips the PATH search in the child.
+PYTHON_BIN = shutil.which(os.environ.get("PYTHON", "python3")) or os.environ.get("PYTHON", "python3")
 WAVESPEED_API_BASE = "https://api.wavespeed.ai/api/v3"
 WIKIPEDIA_API = "https://en.wikipedia.org/w/api.php"
 WIKIMEDIA_COMMONS_API = "https://commons.wikimedia.org/w/api.php"
@@ -50,11 +66,42 @@ FAIL_STATUSES = {"failed", "error", "canceled", "cancelled"}
 ACTIVE_TRIGGER_JOBS: Dict[str, Dict[str, Any]] = {}
 ACTIVE_TRIGGER_LOCK = threading.Lock()
 ACTIVE_SCENE_JOBS: Dict[Tuple[str, str], Dict[str, Any]] = {}
-ACTIVE_SCENE_LOCK = threading.Lock()
-REF_CACHE: Dict[str, str] = {}
+# Same key always maps to the same shard, so per-key check-and-set stays atomic.
+ACTIVE_SCENE_LOCKS = [threading.Lock() for _ in range(16)]
 STYLE_DESC_CACHE: Dict[str, str] = {}
+LOG_CACHE: Dict[Tuple[str, int], Tuple[int, int, str]] = {}
+STYLE_REFS_CACHE: Dict[Tuple[Any, ...], List[str]] = {}
+STYLE_REFS_LOCK = threading.Lock()
+WAVESPEED_CLIENTS: Dict[Tuple[str, int], "WaveSpeedClient"] = {}
+WAVESPEED_CLIENTS_LOCK = threading.Lock()
+UTC_NOW_CACHE: Tuple[int, str] = (0, "")
+TTL_CACHE_VERSION = 0
 BOOTSTRAPPED = False
 BOOTSTRAP_LOCK = threading.Lock()
+LAST_SCENE_JOB_MUTATION = 0.0
+WRITE_QUEUE: "queue.Queue[Tuple[Callable[[sqlite3.Connection], Any], Future]]" = queue.Queue()
+WRITER_THREAD: Optional[threading.Thread] = None
+WRITER_LOCK = threading.Lock()
+SCENE_FINALIZER_THREAD: Optional[threading.Thread] = None
+SCENE_FINALIZER_LOCK = threading.Lock()
+ARCHIVE_PENDING: List[Tuple[str, str]] = []
+ARCHIVE_TIMER: Optional[threading.Timer] = None
+ARCHIVE_LOCK = threading.Lock()
+PAYLOAD_CACHE: Optional[Tuple[Tuple[Any, ...], Dict[str, Any]]] = None
+PAYLOAD_CACHE_LOCK = threading.Lock()
+PAYLOAD_INDEX_STATE: Tuple[int, float] = (-1, 0.0)
+DB_LOCK = threading.RLock()
+DB_LOCAL = threading.local()
+DB_SHARED: Optional[sqlite3.Connection] = None
+DB_SHARED_PATH: Optional[pathlib.Path] = None
+DB_PRAGMAS = (
+    "pragma journal_mode=wal",
+    "pragma synchronous=normal",
+    "pragma temp_store=memory",
+    "pragma mmap_size=268435456",
+    "pragma cache_size=-20000",
+    "pragma busy_timeout=5000",
+)
 
 app = Flask(__name__, template_folder="templates", static_folder="static")
 
@@ -74,6 +121,32 @@ DEFAULT_AIRTABLE_BASE_ID = "appHt83YLWsWPVwrM"
 DEFAULT_AIRTABLE_TABLE_ID = "tblfyiDWbqjj1JLfs"
 DEFAULT_SUPABASE_RUN_TABLE = "aprt_story_payloads"
 AIRTABLE_API_BASE = "https://api.airtable.com/v0"
+BATCH_SUBMIT_WORKERS = 8
+try:
+    # Caps concurrent scene jobs (and so concurrent provider submits) per dashboard process.
+    SCENE_JOB_WORKERS = max(1, int(os.environ.get("DASHBOARD_WORKERS", "8")))
+except ValueError:
+    SCENE_JOB_WORKERS = 8
+LONG_POLL_WAIT_SECONDS = 30
+POLL_BACKOFF_START_SECONDS = 1.0
+SCENE_JOB_STREAM_MAX_SECONDS = 600
+SCENE_JOB_STREAM_MAX_DELAY_SECONDS = 5.0
+SCENE_JOB_STREAM_MAX_IDS = 100
+ARCHIVE_COALESCE_SECONDS = 5.0
+GENERATION_CACHE_TTL_SECONDS = 24 * 3600
+# In-place payload rewrites (cloud transfer status) do not touch the directory mtime; re-diff at least this often.
+PAYLOAD_INDEX_RESCAN_SECONDS = 30.0
+OG_IMAGE_RE = re.compile(
+    rb"<meta[^>]+?(?:property=[\"']og:image[\"'][^>]+?content=[\"']([^\"']+)[\"']"
+    rb"|content=[\"']([^\"']+)[\"'][^>]+?property=[\"']og:image[\"'])",
+    re.IGNORECASE,
+)
+EXT_FROM_URL_RE = re.compile(r"\.(png|jpe?g|webp|gif|mp4|webm|mov)(?:[?#]|$)", re.IGNORECASE)
+PRIMARY_URL_PATTERNS = {
+    "image": (re.compile(r"\.(png|jpg|jpeg|webp)", re.IGNORECASE), {"png": 0, "jpg": 1, "jpeg": 2, "webp": 3}),
+    "video": (re.compile(r"\.(mp4|mov|webm|mkv)", re.IGNORECASE), {"mp4": 0, "mov": 1, "webm": 2, "mkv": 3}),
+}
+SCENE_EXECUTOR = ThreadPoolExecutor(max_workers=SCENE_JOB_WORKERS, thread_name_prefix="scene-job")
 
 
 class DashboardError(RuntimeError):
@@ -88,12 +161,79 @@ def is_serverless_runtime() -> bool:
     return False
 
 
+def json_loads(raw: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def json_dumps(value: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(value, ensure_ascii=True)
+
+
 def is_simulated_url(url: str) -> bool:
     return isinstance(url, str) and url.startswith("https://dry-run.local/")
 
 
 def utc_now() -> str:
-    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    global UTC_NOW_CACHE
+    # Timestamps are second-resolution, so format at most once per wall-clock second.
+    second = int(time.time())
+    cached = UTC_NOW_CACHE
+    if cached[0] == second:
+        return cached[1]
+    text = datetime.fromtimestamp(second, tz=timezone.utc).isoformat()
+    UTC_NOW_CACHE = (second, text)
+    return text
+
+
+def invalidate_ttl_caches() -> None:
+    global TTL_CACHE_VERSION
+    TTL_CACHE_VERSION += 1
+
+
+def ttl_cache(seconds: float) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+    # For zero-argument hot-path readers; invalidate_ttl_caches() expires every cached value at once.
+    def decorate(func: Callable[[], Any]) -> Callable[[], Any]:
+        state: Dict[str, Any] = {}
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper() -> Any:
+            now = time.monotonic()
+            version = TTL_CACHE_VERSION
+            with lock:
+                if state and state["version"] == version and now < state["expires"]:
+                    return state["value"]
+            value = func()
+            with lock:
+                state.update(value=value, expires=now + seconds, version=version)
+            return value
+
+        wrapper.cache_clear = state.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorate
+
+
+def once_per_request(func: Callable[[], Any]) -> Callable[[], Any]:
+    # Endpoints and the helpers they call may each reconcile; within one request only the first call runs.
+    @functools.wraps(func)
+    def wrapper() -> Any:
+        if not has_request_context():
+            return func()
+        done = g.setdefault("once_per_request", set())
+        if func.__name__ in done:
+            return None
+        done.add(func.__name__)
+        return func()
+
+    return wrapper
 
 
 def parse_bool_env(name: str, default: bool) -> bool:
@@ -188,12 +328,78 @@ def ensure_dirs() -> None:
         path.mkdir(parents=True, exist_ok=True)
 
 
-def db_conn() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+def open_db_connection(path: pathlib.Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, cached_statements=256)
     conn.row_factory = sqlite3.Row
+    for pragma in DB_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
+@contextlib.contextmanager
+def db_conn() -> Iterator[sqlite3.Connection]:
+    global DB_SHARED, DB_SHARED_PATH
+    # One process-wide connection; the lock serializes access and each outermost block is one
+    # explicit transaction. Nested blocks join the enclosing transaction.
+    with DB_LOCK:
+        # bootstrap_once can repoint DB_PATH, so reopen when it moves.
+        if DB_SHARED is None or DB_SHARED_PATH != DB_PATH:
+            if DB_SHARED is not None:
+                DB_SHARED.close()
+            DB_SHARED = open_db_connection(DB_PATH)
+            DB_SHARED_PATH = DB_PATH
+        conn = DB_SHARED
+        depth = getattr(DB_LOCAL, "depth", 0)
+        DB_LOCAL.depth = depth + 1
+        try:
+            if depth > 0:
+                yield conn
+                return
+            conn.execute("begin")
+            try:
+                yield conn
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("rollback")
+                raise
+            # executescript commits on its own, so only close what is still open.
+            if conn.in_transaction:
+                conn.execute("commit")
+        finally:
+            DB_LOCAL.depth = depth
+
+
+def db_writer_loop() -> None:
+    while True:
+        work, future = WRITE_QUEUE.get()
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            with db_conn() as conn:
+                result = work(conn)
+        except BaseException as exc:  # noqa: BLE001
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+
+def run_db_write(work: Callable[[sqlite3.Connection], Any]) -> Any:
+    global WRITER_THREAD
+    # Scene job writes funnel through one writer thread instead of N workers contending for
+    # the SQLite write lock. Callers already inside a db_conn block run inline so they cannot
+    # deadlock against the writer.
+    if getattr(DB_LOCAL, "depth", 0) > 0 or (WRITER_THREAD is not None and threading.current_thread() is WRITER_THREAD):
+        with db_conn() as conn:
+            return work(conn)
+    with WRITER_LOCK:
+        if WRITER_THREAD is None or not WRITER_THREAD.is_alive():
+            WRITER_THREAD = threading.Thread(target=db_writer_loop, name="dashboard-db-writer", daemon=True)
+            WRITER_THREAD.start()
+    future: Future = Future()
+    WRITE_QUEUE.put((work, future))
+    return future.result()
+
+
 def init_db() -> None:
     ensure_dirs()
     with db_conn() as conn:
@@ -241,6 +447,28 @@ def init_db() -> None:
                 updated_at text not null
             );
 
+            create table if not exists ref_cache (
+                source text primary key,
+                resolved text not null,
+                fetched_at text not null
+            );
+
+            create table if not exists generation_cache (
+                cache_key text primary key,
+                model text not null,
+                task_id text,
+                url text not null,
+                created_at text not null
+            );
+
+            create table if not exists payload_index (
+                path text primary key,
+                run_id text,
+                mtime_ns integer not null,
+                size integer not null,
+                summary text
+            );
+
             create table if not exists metadata (
                 key text primary key,
                 value text not null,
@@ -282,23 +510,127 @@ def init_db() -> None:
         conn.execute(
             "create index if not exists idx_character_audit_events_target on character_audit_events(target_name)"
         )
+        conn.execute("create index if not exists idx_scene_jobs_status on scene_jobs(status)")
+        conn.execute("create index if not exists idx_scenes_position on scenes(position)")
+        conn.execute("create index if not exists idx_scene_jobs_requested on scene_jobs(requested_at desc)")
+        conn.execute(
+            "create index if not exists idx_scene_jobs_scene on scene_jobs(scene_id, stage, requested_at desc)"
+        )
+        conn.execute("create index if not exists idx_trigger_jobs_requested on trigger_jobs(requested_at desc)")
+        conn.execute("create index if not exists idx_payload_index_mtime on payload_index(mtime_ns desc)")
+        conn.execute("create index if not exists idx_payload_index_run_id on payload_index(run_id)")
+        conn.execute("create index if not exists idx_generation_cache_task on generation_cache(task_id)")
+
+
+# Same shape as utc_now() (second resolution, +00:00 offset) but computed inside SQLite.
+SQL_NOW = "strftime('%Y-%m-%dT%H:%M:%S+00:00', 'now')"
+# Hot-path statements live at module level so every call sends byte-identical SQL text and
+# hits the connection's prepared-statement cache.
+SCENE_COLUMNS_SQL = """
+    scene_id, position, narration, image_prompt, motion_prompt,
+    reference_images, image_status, image_task_id, image_url,
+    video_status, video_task_id, video_url, last_error, updated_at
+"""
+SCENE_JOB_COLUMNS_SQL = "id, scene_id, stage, mode, status, requested_at, finished_at, task_id, result_url, error"
+SQL_SET_META = f"""
+    insert into metadata(key, value, updated_at)
+    values (?, ?, {SQL_NOW})
+    on conflict(key) do update set value=excluded.value, updated_at=excluded.updated_at
+"""
+SQL_GET_META = "select value from metadata where key = ?"
+SQL_LIST_SCENES = f"select {SCENE_COLUMNS_SQL} from scenes order by position asc"
+SQL_GET_SCENE = f"select {SCENE_COLUMNS_SQL} from scenes where scene_id = ?"
+SQL_INSERT_SCENE_JOB = """
+    insert into scene_jobs(id, scene_id, stage, mode, status, requested_at, task_id, result_url, error)
+    values (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_FINISH_SCENE_JOB = f"""
+    update scene_jobs
+    set status = ?, task_id = ?, result_url = ?, error = ?, finished_at = {SQL_NOW}
+    where id = ?
+"""
+SQL_SET_SCENE_JOB_TASK_ID = "update scene_jobs set task_id = ? where id = ?"
+SQL_COUNT_RUNNING_SCENE_JOBS = "select count(1) as n from scene_jobs where status = 'running'"
+SQL_COUNT_SUBMITTED_SCENE_JOBS = (
+    "select count(1) as n from scene_jobs where status = 'running' and task_id is not null and task_id != ''"
+)
+SQL_LIST_SCENE_JOBS = f"select {SCENE_JOB_COLUMNS_SQL} from scene_jobs order by requested_at desc limit ?"
+SQL_GET_SCENE_JOB = f"select {SCENE_JOB_COLUMNS_SQL} from scene_jobs where id = ?"
+SQL_LIST_TRIGGER_JOBS = """
+    select id, requested_at, finished_at, mode, provider, status, pid, exit_code, log_path
+    from trigger_jobs
+    order by requested_at desc
+    limit ?
+"""
 
 
 def set_meta(key: str, value: str) -> None:
+    with db_conn() as conn:
+        conn.execute(SQL_SET_META, (key, value))
+
+
+def set_meta_bulk(pairs: Iterable[Tuple[str, str]]) -> None:
+    rows = [(key, value) for key, value in pairs]
+    if not rows:
+        return
+    with db_conn() as conn:
+        conn.executemany(SQL_SET_META, rows)
+
+
+def get_ref_cache(source: str) -> Optional[str]:
+    with db_conn() as conn:
+        row = conn.execute("select resolved from ref_cache where source = ?", (source,)).fetchone()
+    return row["resolved"] if row else None
+
+
+def set_ref_cache(source: str, resolved: str) -> None:
     with db_conn() as conn:
         conn.execute(
-            """
-            insert into metadata(key, value, updated_at)
-            values (?, ?, ?)
-            on conflict(key) do update set value=excluded.value, updated_at=excluded.updated_at
-            """,
-            (key, value, utc_now()),
+            "insert or replace into ref_cache(source, resolved, fetched_at) values (?, ?, ?)",
+            (source, resolved, utc_now()),
+        )
+
+
+def generation_cache_key(model: str, payload: Dict[str, Any]) -> str:
+    raw = json.dumps({"model": model, "input": payload}, sort_keys=True, ensure_ascii=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_generation_cache(cache_key: str) -> Optional[Dict[str, str]]:
+    # Provider output URLs are not permanent, so only reuse recent results.
+    cutoff = (datetime.now(timezone.utc) - timedelta(seconds=GENERATION_CACHE_TTL_SECONDS)).replace(microsecond=0)
+    with db_conn() as conn:
+        row = conn.execute(
+            "select task_id, url from generation_cache where cache_key = ? and url != '' and created_at >= ?",
+            (cache_key, cutoff.isoformat()),
+        ).fetchone()
+    if row is None:
+        return None
+    return {"task_id": str(row["task_id"] or ""), "url": str(row["url"])}
+
+
+def set_generation_cache(cache_key: str, model: str, task_id: str, url: str) -> None:
+    run_db_write(
+        lambda conn: conn.execute(
+            "insert or replace into generation_cache(cache_key, model, task_id, url, created_at) values (?, ?, ?, ?, ?)",
+            (cache_key, model, task_id, url, utc_now()),
+        )
+    )
+
+
+def resolve_generation_cache(task_id: str, url: str) -> None:
+    # Submit-only generations leave a pending row (empty url) that is filled in once the task completes.
+    run_db_write(
+        lambda conn: conn.execute(
+            f"update generation_cache set url = ?, created_at = {SQL_NOW} where task_id = ? and url = ''",
+            (url, task_id),
         )
+    )
 
 
 def get_meta(key: str, default: Optional[str] = None) -> Optional[str]:
     with db_conn() as conn:
-        row = conn.execute("select value from metadata where key = ?", (key,)).fetchone()
+        row = conn.execute(SQL_GET_META, (key,)).fetchone()
     return row["value"] if row else default
 
 
@@ -309,7 +641,7 @@ def payload_override_path() -> pathlib.Path:
 def load_payload_base_config() -> Dict[str, Any]:
     if not PAYLOAD_CONFIG_PATH.exists():
         raise DashboardError(f"Missing payload config: {PAYLOAD_CONFIG_PATH}")
-    return json.loads(PAYLOAD_CONFIG_PATH.read_text(encoding="utf-8"))
+    return json_loads(PAYLOAD_CONFIG_PATH.read_bytes())
 
 
 def load_payload_override() -> Dict[str, Any]:
@@ -317,14 +649,14 @@ def load_payload_override() -> Dict[str, Any]:
     if not path.exists():
         return {}
     try:
-        raw = json.loads(path.read_text(encoding="utf-8"))
+        raw = json_loads(path.read_bytes())
     except Exception:
         return {}
     return raw if isinstance(raw, dict) else {}
 
 
 def deep_merge_dict(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
-    merged: Dict[str, Any] = json.loads(json.dumps(base))
+    merged: Dict[str, Any] = json_loads(json_dumps(base))
     for key, value in override.items():
         if isinstance(value, dict) and isinstance(merged.get(key), dict):
             merged[key] = deep_merge_dict(merged[key], value)
@@ -333,15 +665,47 @@ def deep_merge_dict(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str,
     return merged
 
 
+def file_mtime_ns(path: pathlib.Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def payload_config_cache_key() -> Tuple[Any, ...]:
+    override_path = payload_override_path()
+    return (
+        str(PAYLOAD_CONFIG_PATH),
+        file_mtime_ns(PAYLOAD_CONFIG_PATH),
+        str(override_path),
+        file_mtime_ns(override_path),
+    )
+
+
+def invalidate_payload_config_cache() -> None:
+    global PAYLOAD_CACHE
+    with PAYLOAD_CACHE_LOCK:
+        PAYLOAD_CACHE = None
+
+
 def load_payload_config() -> Dict[str, Any]:
-    base = load_payload_base_config()
-    override = load_payload_override()
-    if not override:
-        return base
-    return deep_merge_dict(base, override)
+    global PAYLOAD_CACHE
+    key = payload_config_cache_key()
+    with PAYLOAD_CACHE_LOCK:
+        cached = PAYLOAD_CACHE
+    if cached is None or cached[0] != key:
+        base = load_payload_base_config()
+        override = load_payload_override()
+        config = deep_merge_dict(base, override) if override else base
+        cached = (key, config)
+        with PAYLOAD_CACHE_LOCK:
+            PAYLOAD_CACHE = cached
+    # Several callers edit the loaded config in place before saving it, so never hand out the cached dict.
+    return copy.deepcopy(cached[1])
 
 
 def save_payload_config(config: Dict[str, Any]) -> str:
+    invalidate_payload_config_cache()
     try:
         PAYLOAD_CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
         PAYLOAD_CONFIG_PATH.write_text(json.dumps(config, indent=2, ensure_ascii=True) + "\n", encoding="utf-8")
@@ -466,6 +830,7 @@ def ensure_character_in_prompt(prompt: str, character_name: str, kind: str) -> s
     return base.strip()
 
 
+@functools.lru_cache(maxsize=512)
 def normalize_scene_prompt_with_guardrails(prompt: str, character_name: str, kind: str, style_description: str) -> str:
     base = ensure_character_in_prompt(prompt, character_name, kind)
     guard = style_guardrail_text(style_description)
@@ -678,6 +1043,11 @@ def update_character_config(payload: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def get_generation_config() -> Dict[str, Any]:
+    return dict(generation_config_for_key(payload_config_cache_key()))
+
+
+@functools.lru_cache(maxsize=4)
+def generation_config_for_key(cache_key: Tuple[Any, ...]) -> Dict[str, Any]:
     cfg = load_payload_config()
     generation = cfg.get("generation") if isinstance(cfg.get("generation"), dict) else {}
     image_model = generation.get("image_model", "google/nano-banana-pro/edit")
@@ -704,6 +1074,11 @@ def get_generation_config() -> Dict[str, Any]:
 
 
 def discover_script_path() -> pathlib.Path:
+    return script_path_for_key(payload_config_cache_key())
+
+
+@functools.lru_cache(maxsize=4)
+def script_path_for_key(cache_key: Tuple[Any, ...]) -> pathlib.Path:
     if PAYLOAD_CONFIG_PATH.exists():
         try:
             payload = load_payload_config()
@@ -718,6 +1093,7 @@ def discover_script_path() -> pathlib.Path:
     return DEFAULT_SCRIPT_PATH.resolve()
 
 
+@ttl_cache(seconds=10)
 def read_script_panel() -> Dict[str, Any]:
     override_path = DASH_DIR / "script_override.md"
     if override_path.exists():
@@ -735,6 +1111,7 @@ def read_script_panel() -> Dict[str, Any]:
 
 
 def write_script_text(new_text: str) -> Dict[str, Any]:
+    invalidate_ttl_caches()
     script_path = discover_script_path()
     try:
         script_path.parent.mkdir(parents=True, exist_ok=True)
@@ -757,37 +1134,36 @@ def sync_scenes_from_payload() -> None:
         return
 
     with db_conn() as conn:
+        existing = {row["scene_id"] for row in conn.execute("select scene_id from scenes")}
+        to_insert: List[Tuple[Any, ...]] = []
+        to_update: List[Tuple[int, str]] = []
         for index, scene in enumerate(scenes, start=1):
             scene_id = str(scene.get("scene_id") or f"scene_{index:02d}")
+            if scene_id in existing:
+                to_update.append((index, scene_id))
+                continue
+            existing.add(scene_id)
             narration = str(scene.get("narration", "")).strip()
             image_prompt = str(scene.get("image_prompt", "")).strip()
             motion_prompt = str(scene.get("motion_prompt", "")).strip()
             ref_images = scene.get("reference_images", [])
             if not isinstance(ref_images, list):
                 ref_images = []
-            refs_json = json.dumps(ref_images, ensure_ascii=True)
-
-            existing = conn.execute("select scene_id from scenes where scene_id = ?", (scene_id,)).fetchone()
-            if existing is None:
-                conn.execute(
-                    """
-                    insert into scenes (
-                        scene_id, position, narration, image_prompt, motion_prompt,
-                        reference_images, image_status, video_status, updated_at
-                    ) values (?, ?, ?, ?, ?, ?, 'pending', 'pending', ?)
-                    """,
-                    (
-                        scene_id,
-                        index,
-                        narration,
-                        image_prompt,
-                        motion_prompt,
-                        refs_json,
-                        utc_now(),
-                    ),
-                )
-            else:
-                conn.execute("update scenes set position = ? where scene_id = ?", (index, scene_id))
+            refs_json = json_dumps(ref_images)
+            to_insert.append((scene_id, index, narration, image_prompt, motion_prompt, refs_json))
+
+        if to_insert:
+            conn.executemany(
+                f"""
+                insert into scenes (
+                    scene_id, position, narration, image_prompt, motion_prompt,
+                    reference_images, image_status, video_status, updated_at
+                ) values (?, ?, ?, ?, ?, ?, 'pending', 'pending', {SQL_NOW})
+                """,
+                to_insert,
+            )
+        if to_update:
+            conn.executemany("update scenes set position = ? where scene_id = ?", to_update)
 
 
 def bootstrap_once() -> None:
@@ -832,43 +1208,42 @@ def bootstrap_once() -> None:
 
 def parse_ref_images(raw: str) -> List[str]:
     try:
-        parsed = json.loads(raw)
+        parsed = json_loads(raw)
     except Exception:
         return []
     return parsed if isinstance(parsed, list) else []
 
 
-def list_scenes() -> List[Dict[str, Any]]:
+def list_scenes(
+    scene_ids: Optional[Iterable[str]] = None, missing_stage: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    # Filters run in SQL so a subset request never materializes the whole table.
+    clauses: List[str] = []
+    params: List[str] = []
+    if scene_ids is not None:
+        params = list(dict.fromkeys(str(item) for item in scene_ids))
+        if not params:
+            return []
+        clauses.append(f"scene_id in ({', '.join('?' for _ in params)})")
+    if missing_stage in {"image", "video"}:
+        clauses.append(
+            f"({missing_stage}_status != 'completed' or {missing_stage}_url is null or {missing_stage}_url = '')"
+        )
+    sql = SQL_LIST_SCENES
+    if clauses:
+        sql = f"select {SCENE_COLUMNS_SQL} from scenes where {' and '.join(clauses)} order by position asc"
     with db_conn() as conn:
-        rows = conn.execute(
-            """
-            select scene_id, position, narration, image_prompt, motion_prompt,
-                   reference_images, image_status, image_task_id, image_url,
-                   video_status, video_task_id, video_url, last_error, updated_at
-            from scenes
-            order by position asc
-            """
-        ).fetchall()
-    out: List[Dict[str, Any]] = []
-    for row in rows:
-        item = dict(row)
-        item["reference_images"] = parse_ref_images(item.get("reference_images", "[]"))
-        out.append(item)
-    return out
+        rows = conn.execute(sql, params).fetchall()
+    return [scene_from_row(row) for row in rows]  # type: ignore[misc]
 
 
 def get_scene(scene_id: str) -> Optional[Dict[str, Any]]:
     with db_conn() as conn:
-        row = conn.execute(
-            """
-            select scene_id, position, narration, image_prompt, motion_prompt,
-                   reference_images, image_status, image_task_id, image_url,
-                   video_status, video_task_id, video_url, last_error, updated_at
-            from scenes
-            where scene_id = ?
-            """,
-            (scene_id,),
-        ).fetchone()
+        row = conn.execute(SQL_GET_SCENE, (scene_id,)).fetchone()
+    return scene_from_row(row)
+
+
+def scene_from_row(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
     if row is None:
         return None
     item = dict(row)
@@ -876,62 +1251,138 @@ def get_scene(scene_id: str) -> Optional[Dict[str, Any]]:
     return item
 
 
-def update_scene_fields(scene_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    if not fields:
-        return get_scene(scene_id)
-
-    allowed = {
-        "narration",
-        "image_prompt",
-        "motion_prompt",
-        "reference_images",
-        "image_status",
-        "image_task_id",
-        "image_url",
-        "video_status",
-        "video_task_id",
-        "video_url",
-        "last_error",
-    }
+SCENE_UPDATE_FIELDS = {
+    "narration",
+    "image_prompt",
+    "motion_prompt",
+    "reference_images",
+    "image_status",
+    "image_task_id",
+    "image_url",
+    "video_status",
+    "video_task_id",
+    "video_url",
+    "last_error",
+}
+
+
+@functools.lru_cache(maxsize=64)
+def scene_update_sql(columns: FrozenSet[str]) -> Tuple[str, Tuple[str, ...]]:
+    # Same column set -> identical SQL text, so sqlite3's statement cache reuses the prepared statement.
+    ordered = tuple(sorted(columns))
+    set_sql = ", ".join(f"{key} = ?" for key in ordered)
+    sql = f"""
+        update scenes set {set_sql}, updated_at = {SQL_NOW}
+        where scene_id = ?
+        returning {SCENE_COLUMNS_SQL}
+    """
+    return sql, ordered
+
+
+def build_scene_update(scene_id: str, fields: Dict[str, Any]) -> Optional[Tuple[str, List[Any]]]:
     updates: Dict[str, Any] = {}
     for key, value in fields.items():
-        if key not in allowed:
+        if key not in SCENE_UPDATE_FIELDS:
             continue
         if key == "reference_images" and isinstance(value, list):
-            updates[key] = json.dumps(value, ensure_ascii=True)
+            updates[key] = json_dumps(value)
         else:
             updates[key] = value
 
     if not updates:
+        return None
+
+    sql, ordered = scene_update_sql(frozenset(updates))
+    values = [updates[key] for key in ordered] + [scene_id]
+    return sql, values
+
+
+def update_scene_fields(
+    scene_id: str, fields: Dict[str, Any], current: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    # Callers that already hold the row can skip both the write and the read when nothing changes.
+    if current is not None and all(
+        key not in SCENE_UPDATE_FIELDS or current.get(key) == value for key, value in fields.items()
+    ):
+        return current
+    statement = build_scene_update(scene_id, fields) if fields else None
+    if statement is None:
         return get_scene(scene_id)
 
-    updates["updated_at"] = utc_now()
-    set_sql = ", ".join(f"{key} = ?" for key in updates.keys())
-    values = list(updates.values()) + [scene_id]
+    sql, values = statement
+    rows = run_db_write(lambda conn: conn.execute(sql, values).fetchall())
+    return scene_from_row(rows[0] if rows else None)
+
+
+def touch_scene_job_activity() -> None:
+    global LAST_SCENE_JOB_MUTATION
+    LAST_SCENE_JOB_MUTATION = time.monotonic()
+
+
+def scene_job_idle_seconds() -> float:
+    if not LAST_SCENE_JOB_MUTATION:
+        return float("inf")
+    return time.monotonic() - LAST_SCENE_JOB_MUTATION
+
+
+def count_running_scene_jobs() -> int:
     with db_conn() as conn:
-        conn.execute(f"update scenes set {set_sql} where scene_id = ?", values)
-    return get_scene(scene_id)
+        row = conn.execute(SQL_COUNT_RUNNING_SCENE_JOBS).fetchone()
+    return int(row["n"]) if row is not None else 0
+
+
+def scene_job_row(record: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        record["id"],
+        record.get("scene_id"),
+        record["stage"],
+        record["mode"],
+        record["status"],
+        record["requested_at"],
+        record.get("task_id"),
+        record.get("result_url"),
+        record.get("error"),
+    )
 
 
-def insert_scene_job(record: Dict[str, Any]) -> None:
+def count_submitted_scene_jobs() -> int:
     with db_conn() as conn:
-        conn.execute(
-            """
-            insert into scene_jobs(id, scene_id, stage, mode, status, requested_at, task_id, result_url, error)
-            values (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                record["id"],
-                record.get("scene_id"),
-                record["stage"],
-                record["mode"],
-                record["status"],
-                record["requested_at"],
-                record.get("task_id"),
-                record.get("result_url"),
-                record.get("error"),
-            ),
-        )
+        row = conn.execute(SQL_COUNT_SUBMITTED_SCENE_JOBS).fetchone()
+    return int(row["n"] if row else 0)
+
+
+def mark_scene_job_submitted(job_id: str, scene_id: str, stage: str, task_id: str) -> None:
+    if not task_id:
+        raise DashboardError("WaveSpeed submit did not return a task id.")
+    touch_scene_job_activity()
+    statement = build_scene_update(
+        scene_id, {f"{stage}_status": "running", f"{stage}_task_id": task_id, "last_error": None}
+    )
+
+    def apply(conn: sqlite3.Connection) -> None:
+        if statement is not None:
+            conn.execute(*statement).fetchall()
+        conn.execute(SQL_SET_SCENE_JOB_TASK_ID, (task_id, job_id))
+
+    run_db_write(apply)
+
+
+def insert_scene_jobs_bulk(records: List[Dict[str, Any]]) -> None:
+    # One transaction for the whole batch: job rows plus the matching scene "running" flags.
+    touch_scene_job_activity()
+    rows = [scene_job_row(record) for record in records]
+    statements = [
+        build_scene_update(record["scene_id"], {f"{record['stage']}_status": "running", "last_error": None})
+        for record in records
+    ]
+
+    def apply(conn: sqlite3.Connection) -> None:
+        conn.executemany(SQL_INSERT_SCENE_JOB, rows)
+        for statement in statements:
+            if statement is not None:
+                conn.execute(*statement).fetchall()
+
+    run_db_write(apply)
 
 
 def update_scene_job(
@@ -942,53 +1393,43 @@ def update_scene_job(
     result_url: Optional[str] = None,
     error: Optional[str] = None,
 ) -> None:
-    with db_conn() as conn:
-        conn.execute(
-            """
-            update scene_jobs
-            set status = ?, task_id = ?, result_url = ?, error = ?, finished_at = ?
-            where id = ?
-            """,
-            (status, task_id, result_url, error, utc_now(), job_id),
-        )
+    touch_scene_job_activity()
+    run_db_write(lambda conn: conn.execute(SQL_FINISH_SCENE_JOB, (status, task_id, result_url, error, job_id)))
 
 
-def set_scene_job_task_id(job_id: str, task_id: str) -> None:
-    with db_conn() as conn:
-        conn.execute(
-            """
-            update scene_jobs
-            set task_id = ?
-            where id = ?
-            """,
-            (task_id, job_id),
-        )
+def update_scene_and_job_atomic(
+    scene_id: str,
+    scene_updates: Dict[str, Any],
+    job_id: str,
+    job_updates: Dict[str, Any],
+) -> None:
+    touch_scene_job_activity()
+    statement = build_scene_update(scene_id, scene_updates)
+    job_values = (
+        job_updates["status"],
+        job_updates.get("task_id"),
+        job_updates.get("result_url"),
+        job_updates.get("error"),
+        job_id,
+    )
+
+    def apply(conn: sqlite3.Connection) -> None:
+        if statement is not None:
+            conn.execute(*statement).fetchall()
+        conn.execute(SQL_FINISH_SCENE_JOB, job_values)
+
+    run_db_write(apply)
 
 
 def list_scene_jobs(limit: int = 120) -> List[Dict[str, Any]]:
     with db_conn() as conn:
-        rows = conn.execute(
-            """
-            select id, scene_id, stage, mode, status, requested_at, finished_at, task_id, result_url, error
-            from scene_jobs
-            order by requested_at desc
-            limit ?
-            """,
-            (limit,),
-        ).fetchall()
+        rows = conn.execute(SQL_LIST_SCENE_JOBS, (limit,)).fetchall()
     return [dict(row) for row in rows]
 
 
 def get_scene_job(job_id: str) -> Optional[Dict[str, Any]]:
     with db_conn() as conn:
-        row = conn.execute(
-            """
-            select id, scene_id, stage, mode, status, requested_at, finished_at, task_id, result_url, error
-            from scene_jobs
-            where id = ?
-            """,
-            (job_id,),
-        ).fetchone()
+        row = conn.execute(SQL_GET_SCENE_JOB, (job_id,)).fetchone()
     return dict(row) if row is not None else None
 
 
@@ -1014,36 +1455,55 @@ def insert_trigger_job(record: Dict[str, Any]) -> None:
 def update_trigger_job(job_id: str, *, status: str, exit_code: Optional[int]) -> None:
     with db_conn() as conn:
         conn.execute(
-            """
+            f"""
             update trigger_jobs
-            set status = ?, exit_code = ?, finished_at = ?
+            set status = ?, exit_code = ?, finished_at = {SQL_NOW}
             where id = ?
             """,
-            (status, exit_code, utc_now(), job_id),
+            (status, exit_code, job_id),
         )
 
 
 def list_trigger_jobs(limit: int = 60) -> List[Dict[str, Any]]:
     with db_conn() as conn:
-        rows = conn.execute(
-            """
-            select id, requested_at, finished_at, mode, provider, status, pid, exit_code, log_path
-            from trigger_jobs
-            order by requested_at desc
-            limit ?
-            """,
-            (limit,),
-        ).fetchall()
+        rows = conn.execute(SQL_LIST_TRIGGER_JOBS, (limit,)).fetchall()
     return [dict(row) for row in rows]
 
 
 def tail_log(path: pathlib.Path, max_lines: int = 180) -> str:
-    if not path.exists():
+    try:
+        stat = path.stat()
+    except OSError:
         return ""
-    lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
-    return "\n".join(lines[-max_lines:])
-
-
+    # Logs are append-only, so an unchanged size/mtime means an unchanged tail.
+    cache_key = (str(path), max_lines)
+    cached = LOG_CACHE.get(cache_key)
+    if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+        return cached[2]
+    # Read backwards from EOF so the cost tracks the tail size, not the log size.
+    chunk_size = 64 * 1024
+    with path.open("rb") as handle:
+        handle.seek(0, os.SEEK_END)
+        pos = handle.tell()
+        chunks: List[bytes] = []
+        newlines = 0
+        while pos > 0 and newlines <= max_lines:
+            step = min(chunk_size, pos)
+            pos -= step
+            handle.seek(pos)
+            chunk = handle.read(step)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+    lines = b"".join(reversed(chunks)).decode("utf-8", errors="replace").splitlines()
+    text = "\n".join(lines[-max_lines:])
+    if len(LOG_CACHE) >= 64:
+        LOG_CACHE.clear()
+    LOG_CACHE[cache_key] = (stat.st_size, stat.st_mtime_ns, text)
+    return text
+
+
+@once_per_request
+@ttl_cache(seconds=10)
 def reconcile_trigger_jobs() -> None:
     with ACTIVE_TRIGGER_LOCK:
         done_ids: List[str] = []
@@ -1064,14 +1524,62 @@ def reconcile_trigger_jobs() -> None:
 
 def reconcile_provider_jobs() -> None:
     refresh_character_state_from_provider()
+    # Idle dashboards should not cost provider round-trips; only poll while jobs are in flight.
+    if count_running_scene_jobs() == 0:
+        return
+    if not is_serverless_runtime():
+        # Long-lived processes hand provider polling to the background finalizer.
+        ensure_scene_finalizer()
+        return
     refresh_running_scene_jobs_from_provider()
 
 
+def ensure_scene_finalizer() -> None:
+    global SCENE_FINALIZER_THREAD
+    if not os.getenv("WAVESPEED_API_KEY", "").strip():
+        return
+    with SCENE_FINALIZER_LOCK:
+        if SCENE_FINALIZER_THREAD is not None:
+            return
+        SCENE_FINALIZER_THREAD = threading.Thread(target=scene_finalizer_loop, name="scene-finalizer", daemon=True)
+        SCENE_FINALIZER_THREAD.start()
+
+
+def scene_finalizer_loop() -> None:
+    # One thread closes out every submitted live task, instead of one blocked worker per job.
+    global SCENE_FINALIZER_THREAD
+    delay = POLL_BACKOFF_START_SECONDS
+    try:
+        while True:
+            try:
+                refresh_running_scene_jobs_from_provider(max_jobs=50)
+            except Exception:
+                pass
+            with SCENE_FINALIZER_LOCK:
+                # Checked under the lock so a job submitted concurrently either is seen here or restarts the thread.
+                if not os.getenv("WAVESPEED_API_KEY", "").strip() or count_submitted_scene_jobs() == 0:
+                    SCENE_FINALIZER_THREAD = None
+                    return
+            time.sleep(delay)
+            delay = min(float(get_generation_config()["poll_interval_seconds"]), delay * 1.5)
+    finally:
+        # Any unexpected exit (config read, DB error) must let ensure_scene_finalizer() start a new thread.
+        with SCENE_FINALIZER_LOCK:
+            if SCENE_FINALIZER_THREAD is threading.current_thread():
+                SCENE_FINALIZER_THREAD = None
+
+
 def summarize_payload(path: pathlib.Path) -> Optional[Dict[str, Any]]:
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json_loads(path.read_bytes())
     except Exception:
         return None
+    return summarize_payload_data(data, path, path.stat().st_mtime)
+
+
+def summarize_payload_data(data: Any, path: pathlib.Path, mtime: float) -> Optional[Dict[str, Any]]:
+    if not isinstance(data, dict):
+        return None
     run = data.get("run", {}) if isinstance(data.get("run"), dict) else {}
     cloud = data.get("cloud_transfer", {}) if isinstance(data.get("cloud_transfer"), dict) else {}
     scenes = data.get("scenes", [])
@@ -1086,28 +1594,112 @@ def summarize_payload(path: pathlib.Path) -> Optional[Dict[str, Any]]:
         "cloud_status": cloud.get("status"),
         "cloud_destination": cloud.get("destination"),
         "payload_path": str(path.resolve()),
-        "updated_at": datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc).isoformat(),
+        "updated_at": datetime.fromtimestamp(mtime, tz=timezone.utc).isoformat(),
     }
 
 
-def list_local_runs(limit: int = 140) -> List[Dict[str, Any]]:
-    if not RUN_DIR.exists():
+def iter_payload_entries() -> List[os.DirEntry]:
+    # scandir hands back cached stat data with each entry instead of a separate stat per glob hit.
+    try:
+        with os.scandir(RUN_DIR) as entries:
+            return [
+                entry
+                for entry in entries
+                if entry.name.startswith("payload_") and entry.name.endswith(".json") and entry.is_file()
+            ]
+    except OSError:
         return []
-    payloads = sorted(RUN_DIR.glob("payload_*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
-    out: List[Dict[str, Any]] = []
-    for path in payloads[:limit]:
+
+
+def run_dir_mtime_ns() -> int:
+    try:
+        return RUN_DIR.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def refresh_payload_index() -> None:
+    # Diff the run directory against payload_index so only new or rewritten payloads get parsed.
+    # The diff itself stats every payload, so it is skipped while the directory is unchanged and
+    # the last diff is recent; the dashboard's own writes are indexed by write_indexed_payload.
+    global PAYLOAD_INDEX_STATE
+    dir_mtime_ns = run_dir_mtime_ns()
+    last_mtime_ns, last_scan = PAYLOAD_INDEX_STATE
+    if dir_mtime_ns == last_mtime_ns and time.monotonic() - last_scan < PAYLOAD_INDEX_RESCAN_SECONDS:
+        return
+    PAYLOAD_INDEX_STATE = (dir_mtime_ns, time.monotonic())
+
+    on_disk: Dict[str, Tuple[pathlib.Path, int, int]] = {}
+    for entry in iter_payload_entries():
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        path = RUN_DIR / entry.name
+        on_disk[str(path)] = (path, stat.st_mtime_ns, stat.st_size)
+
+    with db_conn() as conn:
+        indexed = {
+            row["path"]: (row["mtime_ns"], row["size"])
+            for row in conn.execute("select path, mtime_ns, size from payload_index")
+        }
+    stale = [key for key in indexed if key not in on_disk]
+    changed = [item for key, item in on_disk.items() if indexed.get(key) != (item[1], item[2])]
+    if not stale and not changed:
+        return
+
+    rows: List[Tuple[Any, ...]] = []
+    for path, mtime_ns, size in changed:
         summary = summarize_payload(path)
-        if summary:
-            out.append(summary)
-    return out
+        run_id = str(summary.get("run_id") or "") if summary else None
+        rows.append((str(path), run_id, mtime_ns, size, json_dumps(summary) if summary else None))
+    with db_conn() as conn:
+        if stale:
+            conn.executemany("delete from payload_index where path = ?", [(key,) for key in stale])
+        if rows:
+            conn.executemany(
+                "insert or replace into payload_index(path, run_id, mtime_ns, size, summary) values (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+
+def write_indexed_payload(path: pathlib.Path, data: Dict[str, Any]) -> None:
+    # Seed payload_index from the in-memory snapshot so listing never has to re-parse our own writes.
+    global PAYLOAD_INDEX_STATE
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=True) + "\n", encoding="utf-8")
+    stat = path.stat()
+    summary = summarize_payload_data(data, path, stat.st_mtime)
+    run_id = str(summary.get("run_id") or "") if summary else None
+    with db_conn() as conn:
+        conn.execute(
+            "insert or replace into payload_index(path, run_id, mtime_ns, size, summary) values (?, ?, ?, ?, ?)",
+            (str(path), run_id, stat.st_mtime_ns, stat.st_size, json_dumps(summary) if summary else None),
+        )
+    # Our own write changed the directory mtime; record it so the next listing does not re-diff for it.
+    if PAYLOAD_INDEX_STATE[0] != -1:
+        PAYLOAD_INDEX_STATE = (run_dir_mtime_ns(), PAYLOAD_INDEX_STATE[1])
+
+
+def list_local_runs(limit: int = 140) -> List[Dict[str, Any]]:
+    refresh_payload_index()
+    with db_conn() as conn:
+        rows = conn.execute(
+            "select summary from payload_index where summary is not null order by mtime_ns desc limit ?",
+            (limit,),
+        ).fetchall()
+    return [json_loads(row["summary"]) for row in rows]
 
 
 def read_local_payload_by_run_id(run_id: str) -> Optional[Dict[str, Any]]:
-    if not RUN_DIR.exists():
-        return None
-    for path in RUN_DIR.glob("payload_*.json"):
+    refresh_payload_index()
+    with db_conn() as conn:
+        rows = conn.execute(
+            "select path from payload_index where run_id = ? order by mtime_ns desc",
+            (run_id,),
+        ).fetchall()
+    for row in rows:
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
+            data = json_loads(pathlib.Path(row["path"]).read_bytes())
         except Exception:
             continue
         if data.get("run_id") == run_id:
@@ -1392,7 +1984,7 @@ def write_run_snapshot(snapshot: Dict[str, Any]) -> pathlib.Path:
     run_id = str(snapshot.get("run_id", "")).strip() or f"dash-{uuid.uuid4().hex[:8]}"
     safe_run_id = re.sub(r"[^A-Za-z0-9._-]+", "_", run_id)
     path = RUN_DIR / f"payload_{safe_run_id}.json"
-    path.write_text(json.dumps(snapshot, indent=2, ensure_ascii=True) + "\n", encoding="utf-8")
+    write_indexed_payload(path, snapshot)
     return path
 
 
@@ -1582,6 +2174,46 @@ def sync_snapshot_to_airtable(snapshot: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def schedule_dashboard_archive(source: str, mode: str) -> None:
+    global ARCHIVE_TIMER
+    if is_serverless_runtime():
+        # No process outlives the request here, so archive inline.
+        try:
+            archive_dashboard_run(source=source, mode=mode, provider="auto")
+        except Exception:
+            pass
+        return
+    # Scene completions land in bursts; one snapshot a few seconds later covers all of them.
+    with ARCHIVE_LOCK:
+        ARCHIVE_PENDING.append((source, mode))
+        if ARCHIVE_TIMER is None:
+            ARCHIVE_TIMER = threading.Timer(ARCHIVE_COALESCE_SECONDS, flush_dashboard_archives)
+            ARCHIVE_TIMER.daemon = True
+            ARCHIVE_TIMER.start()
+
+
+def flush_dashboard_archives() -> None:
+    global ARCHIVE_TIMER
+    with ARCHIVE_LOCK:
+        pending = list(ARCHIVE_PENDING)
+        ARCHIVE_PENDING.clear()
+        if ARCHIVE_TIMER is not None:
+            ARCHIVE_TIMER.cancel()
+        ARCHIVE_TIMER = None
+    if not pending:
+        return
+    sources = list(dict.fromkeys(source for source, _ in pending))
+    mode = "live" if any(item_mode == "live" for _, item_mode in pending) else "dry_run"
+    try:
+        archive_dashboard_run(source=sources[0] if len(sources) == 1 else "scene_batch", mode=mode, provider="auto")
+    except Exception:
+        pass
+
+
+# Do not drop a pending archive when the dashboard shuts down inside the coalescing window.
+atexit.register(flush_dashboard_archives)
+
+
 def archive_dashboard_run(
     *,
     source: str,
@@ -1615,7 +2247,7 @@ def archive_dashboard_run(
                 "message": " ; ".join([str(item.get("message", "")) for item in results if item.get("status") != "success"]),
             }
         )
-    payload_path.write_text(json.dumps(snapshot, indent=2, ensure_ascii=True) + "\n", encoding="utf-8")
+    write_indexed_payload(payload_path, snapshot)
     return {
         "run_id": snapshot.get("run_id"),
         "payload_path": str(payload_path.resolve()),
@@ -1624,6 +2256,7 @@ def archive_dashboard_run(
     }
 
 
+@ttl_cache(seconds=60)
 def load_workflow_crons() -> List[str]:
     if not WORKFLOW_PATH.exists():
         return []
@@ -1644,6 +2277,7 @@ def load_workflow_crons() -> List[str]:
     return out
 
 
+@ttl_cache(seconds=60)
 def load_local_cron_entries() -> List[str]:
     try:
         proc = subprocess.run(["crontab", "-l"], capture_output=True, text=True, check=False, timeout=5)
@@ -1662,29 +2296,25 @@ def load_local_cron_entries() -> List[str]:
 
 
 def is_url(value: str) -> bool:
-    return value.startswith("http://") or value.startswith("https://")
+    return value.startswith(("http://", "https://"))
 
 
 def maybe_resolve_reference_url(url: str) -> str:
     if "pin.it/" not in url and "pinterest." not in url:
         return url
-    if url in REF_CACHE:
-        return REF_CACHE[url]
+    cached = get_ref_cache(url)
+    if cached is not None:
+        return cached
     try:
         response = requests.get(url, timeout=20, allow_redirects=True, headers={"User-Agent": "Mozilla/5.0"})
         ctype = response.headers.get("Content-Type", "").lower()
         resolved = response.url
         if "text/html" in ctype:
-            patterns = [
-                r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']',
-                r'<meta[^>]+content=["\']([^"\']+)["\'][^>]+property=["\']og:image["\']',
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, response.text, flags=re.IGNORECASE)
-                if match:
-                    resolved = html.unescape(match.group(1))
-                    break
-        REF_CACHE[url] = resolved
+            match = OG_IMAGE_RE.search(response.content)
+            if match:
+                raw = match.group(1) or match.group(2)
+                resolved = html.unescape(raw.decode("utf-8", errors="replace"))
+        set_ref_cache(url, resolved)
         return resolved
     except Exception:
         return url
@@ -2679,18 +3309,18 @@ def extract_task_id(payload: Dict[str, Any]) -> Optional[str]:
 
 
 def collect_urls(value: Any) -> List[str]:
+    # Iterative depth-first walk; children are pushed in reverse so URLs keep document order.
     out: List[str] = []
-    if isinstance(value, str):
-        if is_url(value):
-            out.append(value)
-        return out
-    if isinstance(value, list):
-        for item in value:
-            out.extend(collect_urls(item))
-        return out
-    if isinstance(value, dict):
-        for nested in value.values():
-            out.extend(collect_urls(nested))
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            if is_url(node):
+                out.append(node)
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            stack.extend(reversed(list(node.values())))
     return out
 
 
@@ -2711,20 +3341,31 @@ def extract_error_message(payload: Dict[str, Any]) -> str:
 def choose_primary_url(urls: List[str], kind: str) -> str:
     if not urls:
         raise DashboardError(f"No output URL returned for {kind}.")
-    lowered = [url.lower() for url in urls]
-    priorities = [".png", ".jpg", ".jpeg", ".webp"] if kind == "image" else [".mp4", ".mov", ".webm", ".mkv"]
-    for ext in priorities:
-        for idx, item in enumerate(lowered):
-            if ext in item:
-                return urls[idx]
-    return urls[0]
+    # One regex pass per URL; lower rank wins, earlier URL wins ties (same result as scanning per extension).
+    pattern, ranks = PRIMARY_URL_PATTERNS["image" if kind == "image" else "video"]
+    best_rank = len(ranks)
+    best_url = urls[0]
+    for url in urls:
+        for match in pattern.finditer(url):
+            rank = ranks[match.group(1).lower()]
+            if rank < best_rank:
+                if rank == 0:
+                    return url
+                best_rank = rank
+                best_url = url
+    return best_url
 
 
 def latest_payload_path() -> Optional[pathlib.Path]:
-    if not RUN_DIR.exists():
-        return None
-    payloads = sorted(RUN_DIR.glob("payload_*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
-    return payloads[0] if payloads else None
+    latest: Optional[Tuple[int, str]] = None
+    for entry in iter_payload_entries():
+        try:
+            mtime_ns = entry.stat().st_mtime_ns
+        except OSError:
+            continue
+        if latest is None or mtime_ns > latest[0]:
+            latest = (mtime_ns, entry.name)
+    return RUN_DIR / latest[1] if latest else None
 
 
 def stream_file_response(path: pathlib.Path, download_name: str, mimetype: str = "application/octet-stream") -> Response:
@@ -2758,12 +3399,15 @@ class WaveSpeedClient:
     def __init__(self, api_key: str, timeout_sec: int = 90) -> None:
         self.api_key = api_key
         self.timeout_sec = timeout_sec
-
-    def _headers(self) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+        # Keep-alive session shared by submit/poll/upload. Only idempotent GETs are retried on
+        # gateway errors; a retried submit could start a duplicate generation. read=False lets a
+        # long-poll read timeout surface as requests.Timeout instead of being retried into MaxRetryError.
+        retry = Retry(total=3, read=False, backoff_factor=0.3, status_forcelist=(502, 503, 504), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Authorization": f"Bearer {self.api_key}"})
 
     def submit_task(self, model_path: str, input_payload: Dict[str, Any]) -> Dict[str, Any]:
         endpoint = f"{WAVESPEED_API_BASE}/{model_path}"
@@ -2771,13 +3415,13 @@ class WaveSpeedClient:
             "enable_base64_output": False,
             "input": input_payload,
         }
-        response = requests.post(endpoint, headers=self._headers(), json=wrapped_body, timeout=self.timeout_sec)
+        response = self.session.post(endpoint, json=wrapped_body, timeout=self.timeout_sec)
 
         # Some models/endpoints expect prompt/image fields at top level instead of under "input".
         if not response.ok and response.status_code == 400:
             fallback_body: Dict[str, Any] = {"enable_base64_output": False}
             fallback_body.update(input_payload)
-            fallback = requests.post(endpoint, headers=self._headers(), json=fallback_body, timeout=self.timeout_sec)
+            fallback = self.session.post(endpoint, json=fallback_body, timeout=self.timeout_sec)
             if fallback.ok:
                 response = fallback
             else:
@@ -2798,14 +3442,24 @@ class WaveSpeedClient:
             raise DashboardError(f"WaveSpeed did not return task id for {model_path}.")
         return payload
 
-    def get_task(self, task_id: str) -> Dict[str, Any]:
+    def get_task(self, task_id: str, wait_seconds: int = 0) -> Dict[str, Any]:
+        return self.fetch_task(task_id, wait_seconds=wait_seconds)[0]
+
+    def fetch_task(self, task_id: str, wait_seconds: int = 0) -> Tuple[Dict[str, Any], Optional[float]]:
         endpoints = [
             f"{WAVESPEED_API_BASE}/predictions/{task_id}/result",
             f"{WAVESPEED_API_BASE}/predictions/{task_id}",
         ]
+        headers: Dict[str, str] = {}
+        timeout: Any = self.timeout_sec
+        if wait_seconds > 0:
+            # Ask the server to hold the request open until the task changes state; the read
+            # timeout has to outlast the requested wait.
+            headers["Prefer"] = f"wait={wait_seconds}"
+            timeout = (min(self.timeout_sec, 15), wait_seconds + 15)
         last_404 = False
         for endpoint in endpoints:
-            response = requests.get(endpoint, headers={"Authorization": f"Bearer {self.api_key}"}, timeout=self.timeout_sec)
+            response = self.session.get(endpoint, headers=headers, timeout=timeout)
             if response.status_code == 404:
                 last_404 = True
                 continue
@@ -2815,7 +3469,7 @@ class WaveSpeedClient:
                     detail = detail[:700] + "..."
                 raise DashboardError(f"WaveSpeed task lookup failed ({response.status_code}): {detail}")
             try:
-                return response.json()
+                return response.json(), parse_retry_after(response.headers.get("Retry-After"))
             except ValueError as exc:
                 raise DashboardError(f"WaveSpeed task lookup returned non-JSON for task {task_id}.") from exc
         if last_404:
@@ -2824,8 +3478,9 @@ class WaveSpeedClient:
 
     def poll_task(self, task_id: str, poll_interval_sec: int, timeout_sec: int) -> Dict[str, Any]:
         started = time.time()
+        interval = POLL_BACKOFF_START_SECONDS
         while True:
-            payload = self.get_task(task_id)
+            payload, retry_after = self.fetch_task(task_id)
             status = normalize_status(payload)
             if status in SUCCESS_STATUSES:
                 return payload
@@ -2833,29 +3488,62 @@ class WaveSpeedClient:
                 raise DashboardError(f"WaveSpeed task {task_id} failed: {extract_error_message(payload)}")
             if time.time() - started > timeout_sec:
                 raise DashboardError(f"WaveSpeed polling timeout for task {task_id}.")
-            time.sleep(max(1, poll_interval_sec))
+            time.sleep(retry_after if retry_after is not None else interval)
+            interval = next_poll_interval(interval, poll_interval_sec)
+
+    def poll_task_long(
+        self,
+        task_id: str,
+        poll_interval_sec: int,
+        timeout_sec: int,
+        wait_seconds: int = LONG_POLL_WAIT_SECONDS,
+    ) -> Dict[str, Any]:
+        started = time.time()
+        interval = POLL_BACKOFF_START_SECONDS
+        while True:
+            remaining = timeout_sec - (time.time() - started)
+            if remaining <= 0:
+                raise DashboardError(f"WaveSpeed polling timeout for task {task_id}.")
+            request_started = time.time()
+            wait = max(1, min(wait_seconds, int(remaining)))
+            try:
+                payload, retry_after = self.fetch_task(task_id, wait_seconds=wait)
+            except requests.Timeout:
+                continue
+            status = normalize_status(payload)
+            if status in SUCCESS_STATUSES:
+                return payload
+            if status in FAIL_STATUSES:
+                raise DashboardError(f"WaveSpeed task {task_id} failed: {extract_error_message(payload)}")
+            # Only a response the server actually held for the wait counts as a long-poll; anything
+            # quicker (wait hint ignored, however slow the reply) falls back to backoff polling.
+            if time.time() - request_started < wait / 2:
+                remaining = timeout_sec - (time.time() - started)
+                time.sleep(max(0.0, min(retry_after if retry_after is not None else interval, remaining)))
+                interval = next_poll_interval(interval, poll_interval_sec)
 
     def upload_local_file(self, path: pathlib.Path) -> str:
         endpoint = f"{WAVESPEED_API_BASE}/media/upload/binary"
         content_type = mimetypes.guess_type(str(path))[0] or "application/octet-stream"
-        raw = path.read_bytes()
 
-        response = requests.post(
-            endpoint,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": content_type,
-            },
-            data=raw,
-            timeout=self.timeout_sec,
-        )
-        if not response.ok:
-            response = requests.post(
+        # Stream from the file handle so large videos are not buffered in memory.
+        with path.open("rb") as handle:
+            response = self.session.post(
                 endpoint,
-                headers={"Authorization": f"Bearer {self.api_key}"},
-                files={"file": (path.name, raw, content_type)},
+                headers={
+                    "Content-Type": content_type,
+                    "Content-Length": str(os.fstat(handle.fileno()).st_size),
+                },
+                data=handle,
                 timeout=self.timeout_sec,
             )
+        if not response.ok:
+            with path.open("rb") as handle:
+                response = self.session.post(
+                    endpoint,
+                    files={"file": (path.name, handle, content_type)},
+                    timeout=self.timeout_sec,
+                )
         response.raise_for_status()
         payload = response.json()
         urls = collect_urls(payload)
@@ -2864,21 +3552,53 @@ class WaveSpeedClient:
         return urls[0]
 
 
-def get_wavespeed_client() -> WaveSpeedClient:
+def parse_retry_after(raw: Optional[str]) -> Optional[float]:
+    try:
+        value = float(str(raw or "").strip())
+    except ValueError:
+        return None
+    return value if value >= 0 else None
+
+
+def next_poll_interval(interval: float, poll_interval_sec: int) -> float:
+    # Start fast so short tasks are picked up quickly, then grow toward the configured interval.
+    return min(max(1.0, float(poll_interval_sec)), interval * 1.5)
+
+
+def get_wavespeed_client(timeout_sec: int = 90) -> WaveSpeedClient:
     api_key = os.getenv("WAVESPEED_API_KEY", "")
     if not api_key:
         raise DashboardError("WAVESPEED_API_KEY is missing.")
-    return WaveSpeedClient(api_key=api_key)
+    # Reuse one client (and its connection pool) per key and timeout instead of a fresh one per request.
+    with WAVESPEED_CLIENTS_LOCK:
+        client = WAVESPEED_CLIENTS.get((api_key, timeout_sec))
+        if client is None:
+            client = WaveSpeedClient(api_key=api_key, timeout_sec=timeout_sec)
+            WAVESPEED_CLIENTS[(api_key, timeout_sec)] = client
+    return client
+
+
+def upload_reference_file(client: WaveSpeedClient, path: pathlib.Path, cache_key: str) -> str:
+    uploaded = client.upload_local_file(path)
+    set_ref_cache(cache_key, uploaded)
+    return uploaded
 
 
 def resolve_reference_images(refs: List[str], dry_run: bool, client: Optional[WaveSpeedClient]) -> List[str]:
     out: List[str] = []
+    # Network-bound refs (Pinterest lookups, uploads) are collected and resolved in parallel;
+    # everything else is filled in place so the output keeps the input order.
+    pending: List[Tuple[int, Callable[[], str]]] = []
     for idx, raw in enumerate(refs):
         if not isinstance(raw, str) or not raw.strip():
             continue
         ref = raw.strip()
         if is_url(ref):
-            out.append(maybe_resolve_reference_url(ref))
+            if "pin.it/" in ref or "pinterest." in ref:
+                pending.append((len(out), functools.partial(maybe_resolve_reference_url, ref)))
+                out.append("")
+            else:
+                out.append(ref)
             continue
         path = pathlib.Path(ref).expanduser()
         if not path.is_absolute():
@@ -2891,13 +3611,24 @@ def resolve_reference_images(refs: List[str], dry_run: bool, client: Optional[Wa
             continue
         if client is None:
             raise DashboardError("WaveSpeed client unavailable for local file upload.")
-        cache_key = str(path)
-        if cache_key in REF_CACHE:
-            out.append(REF_CACHE[cache_key])
+        # Key on size and mtime as well, since the cache now outlives edits to the local file.
+        stat = path.stat()
+        cache_key = f"file:{path}:{stat.st_size}:{stat.st_mtime_ns}"
+        cached = get_ref_cache(cache_key)
+        if cached is not None:
+            out.append(cached)
             continue
-        uploaded = client.upload_local_file(path)
-        REF_CACHE[cache_key] = uploaded
-        out.append(uploaded)
+        pending.append((len(out), functools.partial(upload_reference_file, client, path, cache_key)))
+        out.append("")
+
+    if len(pending) == 1:
+        slot, work = pending[0]
+        out[slot] = work()
+    elif pending:
+        with ThreadPoolExecutor(max_workers=min(8, len(pending))) as pool:
+            futures = [(slot, pool.submit(work)) for slot, work in pending]
+            for slot, future in futures:
+                out[slot] = future.result()
 
     if not out:
         raise DashboardError("No valid reference images resolved.")
@@ -2933,11 +3664,15 @@ def update_character_state(
     image_url: Optional[str] = None,
     last_error: Optional[str] = None,
 ) -> None:
-    set_meta("character_status", status)
-    set_meta("character_task_id", task_id or "")
-    set_meta("character_image_url", image_url or "")
-    set_meta("character_last_error", last_error or "")
-    set_meta("character_updated_at", utc_now())
+    set_meta_bulk(
+        [
+            ("character_status", status),
+            ("character_task_id", task_id or ""),
+            ("character_image_url", image_url or ""),
+            ("character_last_error", last_error or ""),
+            ("character_updated_at", utc_now()),
+        ]
+    )
 
 
 def refresh_character_state_from_provider() -> None:
@@ -2951,7 +3686,7 @@ def refresh_character_state_from_provider() -> None:
     if not api_key:
         return
     try:
-        payload = WaveSpeedClient(api_key=api_key, timeout_sec=15).get_task(task_id)
+        payload = get_wavespeed_client(timeout_sec=15).get_task(task_id)
         status = normalize_status(payload)
         if status in SUCCESS_STATUSES:
             urls = collect_urls(payload.get("output", payload))
@@ -2984,7 +3719,7 @@ def refresh_running_scene_jobs_from_provider(max_jobs: int = 10) -> None:
     with db_conn() as conn:
         rows = conn.execute(
             """
-            select id, scene_id, stage, task_id
+            select id, scene_id, stage, task_id, requested_at
             from scene_jobs
             where status = 'running' and task_id is not null and task_id != ''
             order by requested_at asc
@@ -2995,7 +3730,8 @@ def refresh_running_scene_jobs_from_provider(max_jobs: int = 10) -> None:
     if not rows:
         return
 
-    client = WaveSpeedClient(api_key=api_key, timeout_sec=15)
+    client = get_wavespeed_client(timeout_sec=15)
+    timeout_cutoff = datetime.now(timezone.utc) - timedelta(seconds=get_generation_config()["poll_timeout_seconds"])
     for row in rows:
         job_id = row["id"]
         scene_id = row["scene_id"]
@@ -3003,9 +3739,20 @@ def refresh_running_scene_jobs_from_provider(max_jobs: int = 10) -> None:
         task_id = row["task_id"]
         if not scene_id or not stage or not task_id:
             continue
+        # Decided before the GET so a task whose lookups keep failing still times out.
+        timed_out = parse_timestamp(row["requested_at"]) < timeout_cutoff
         try:
             payload = client.get_task(task_id)
-        except Exception:
+        except Exception as exc:  # noqa: BLE001
+            if timed_out:
+                msg = f"Timed out waiting for task {task_id} (last poll error: {exc})"
+                update_scene_and_job_atomic(
+                    scene_id,
+                    {f"{stage}_status": "failed", "last_error": msg},
+                    job_id,
+                    {"status": "failed", "task_id": task_id, "error": msg},
+                )
+                schedule_dashboard_archive(source=f"{stage}_failed", mode="live")
             continue
         status = normalize_status(payload)
         if status in SUCCESS_STATUSES:
@@ -3014,79 +3761,60 @@ def refresh_running_scene_jobs_from_provider(max_jobs: int = 10) -> None:
                 url = choose_primary_url(urls, kind=stage)
             except Exception as exc:  # noqa: BLE001
                 msg = str(exc)
-                if stage == "image":
-                    update_scene_fields(scene_id, {"image_status": "failed", "last_error": msg})
-                else:
-                    update_scene_fields(scene_id, {"video_status": "failed", "last_error": msg})
-                update_scene_job(job_id, status="failed", task_id=task_id, error=msg)
-                try:
-                    archive_dashboard_run(source=f"{stage}_failed", mode="live", provider="auto")
-                except Exception:
-                    pass
-                continue
-
-            if stage == "image":
-                update_scene_fields(
+                update_scene_and_job_atomic(
                     scene_id,
-                    {
-                        "image_status": "completed",
-                        "image_task_id": task_id,
-                        "image_url": url,
-                        "video_status": "pending",
-                        "video_task_id": None,
-                        "video_url": None,
-                        "last_error": None,
-                    },
+                    {f"{stage}_status": "failed", "last_error": msg},
+                    job_id,
+                    {"status": "failed", "task_id": task_id, "error": msg},
                 )
-            else:
-                update_scene_fields(
-                    scene_id,
-                    {
-                        "video_status": "completed",
-                        "video_task_id": task_id,
-                        "video_url": url,
-                        "last_error": None,
-                    },
-                )
-            update_scene_job(job_id, status="completed", task_id=task_id, result_url=url, error=None)
-            try:
-                archive_dashboard_run(source=f"scene_{stage}", mode="live", provider="auto")
-            except Exception:
-                pass
+                schedule_dashboard_archive(source=f"{stage}_failed", mode="live")
+                continue
+
+            complete_scene_job(job_id, scene_id, stage, {"task_id": task_id, "url": url})
+            if url:
+                resolve_generation_cache(task_id, url)
+            schedule_dashboard_archive(source=f"scene_{stage}", mode="live")
             continue
 
-        if status in FAIL_STATUSES:
-            msg = extract_error_message(payload)
-            if stage == "image":
-                update_scene_fields(scene_id, {"image_status": "failed", "last_error": msg})
-            else:
-                update_scene_fields(scene_id, {"video_status": "failed", "last_error": msg})
-            update_scene_job(job_id, status="failed", task_id=task_id, error=msg)
-            try:
-                archive_dashboard_run(source=f"{stage}_failed", mode="live", provider="auto")
-            except Exception:
-                pass
+        if status in FAIL_STATUSES or timed_out:
+            msg = extract_error_message(payload) if status in FAIL_STATUSES else f"Timed out waiting for task {task_id}"
+            update_scene_and_job_atomic(
+                scene_id,
+                {f"{stage}_status": "failed", "last_error": msg},
+                job_id,
+                {"status": "failed", "task_id": task_id, "error": msg},
+            )
+            schedule_dashboard_archive(source=f"{stage}_failed", mode="live")
 
 
 def get_style_reference_urls(dry_run: bool, client: Optional[WaveSpeedClient]) -> List[str]:
-    config = load_payload_config()
-    refs = config.get("style_reference_images", [])
-    if not isinstance(refs, list):
-        refs = []
-    if not refs:
-        return []
-    return resolve_reference_images(refs, dry_run=dry_run, client=client)
+    cache_key = (payload_config_cache_key(), dry_run)
+    # Held across resolve so concurrent scene workers on a cold cache wait for one upload pass.
+    with STYLE_REFS_LOCK:
+        cached = STYLE_REFS_CACHE.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        config = load_payload_config()
+        refs = config.get("style_reference_images", [])
+        if not isinstance(refs, list):
+            refs = []
+        resolved = resolve_reference_images(refs, dry_run=dry_run, client=client) if refs else []
+        # Only successful resolutions land here; failures raise and are retried next call.
+        for stale_key in [key for key in STYLE_REFS_CACHE if key[0] != cache_key[0]]:
+            STYLE_REFS_CACHE.pop(stale_key, None)
+        STYLE_REFS_CACHE[cache_key] = list(resolved)
+        return resolved
 
 
-def preflight_character_for_scene_images(*, dry_run: bool) -> None:
+def preflight_character_for_scene_images(*, dry_run: bool) -> str:
     if dry_run:
-        return
+        return ""
     auto_attach_character_from_story(force=False)
     refresh_character_state_from_provider()
     state = get_character_state()
     image_url = str(state.get("image_url") or "").strip()
     if image_url:
-        return
+        return image_url
 
     status = str(state.get("status") or "").strip().lower()
     task_id = str(state.get("task_id") or "").strip()
@@ -3106,6 +3834,7 @@ def preflight_character_for_scene_images(*, dry_run: bool) -> None:
         raise DashboardError(
             f"Character model generation started{suffix}. Wait until status is completed, then retry scene image."
         )
+    return ""
 
 
 def generate_character_model(dry_run: bool, submit_only: bool = False) -> Dict[str, str]:
@@ -3199,7 +3928,7 @@ def generate_character_model(dry_run: bool, submit_only: bool = False) -> Dict[s
         if submit_only:
             update_character_state(status="running", task_id=task_id, image_url=None, last_error=None)
             return {"task_id": task_id, "image_url": ""}
-        result = client.poll_task(task_id, generation["poll_interval_seconds"], generation["poll_timeout_seconds"])
+        result = client.poll_task_long(task_id, generation["poll_interval_seconds"], generation["poll_timeout_seconds"])
         urls = collect_urls(result.get("output", result))
         image_url = choose_primary_url(urls, kind="image")
         update_character_state(status="completed", task_id=task_id, image_url=image_url, last_error=None)
@@ -3210,8 +3939,17 @@ def generate_character_model(dry_run: bool, submit_only: bool = False) -> Dict[s
         raise
 
 
-def generate_scene_image(scene_id: str, dry_run: bool, submit_only: bool = False) -> Dict[str, str]:
-    scene = get_scene(scene_id)
+def generate_scene_image(
+    scene_id: str,
+    dry_run: bool,
+    submit_only: bool = False,
+    *,
+    scene: Optional[Dict[str, Any]] = None,
+    character_url_override: Optional[str] = None,
+    use_cache: bool = True,
+) -> Dict[str, str]:
+    if scene is None:
+        scene = get_scene(scene_id)
     if scene is None:
         raise DashboardError(f"Scene not found: {scene_id}")
 
@@ -3222,10 +3960,13 @@ def generate_scene_image(scene_id: str, dry_run: bool, submit_only: bool = False
     style_description = get_style_description_from_config(config)
     client = None if dry_run else get_wavespeed_client()
 
-    if not dry_run:
-        refresh_character_state_from_provider()
-    character_state = get_character_state()
-    character_url = character_state.get("image_url")
+    # Batch launches resolve the character once up front; single-scene calls look it up here.
+    character_url = character_url_override
+    if not character_url:
+        if not dry_run:
+            refresh_character_state_from_provider()
+        character_state = get_character_state()
+        character_url = character_state.get("image_url")
     if not character_url:
         if dry_run:
             generated = generate_character_model(dry_run=True, submit_only=False)
@@ -3287,18 +4028,35 @@ def generate_scene_image(scene_id: str, dry_run: bool, submit_only: bool = False
         "resolution": generation["image_resolution"],
         "output_format": generation["image_output_format"],
     }
+    cache_key = generation_cache_key(generation["image_model"], payload)
+    if use_cache:
+        cached = get_generation_cache(cache_key)
+        if cached is not None:
+            return cached
     submit = client.submit_task(generation["image_model"], payload)  # type: ignore[union-attr]
     task_id = extract_task_id(submit) or ""
     if submit_only:
+        if task_id:
+            set_generation_cache(cache_key, generation["image_model"], task_id, "")
         return {"task_id": task_id, "url": ""}
-    result = client.poll_task(task_id, generation["poll_interval_seconds"], generation["poll_timeout_seconds"])  # type: ignore[union-attr]
+    result = client.poll_task_long(task_id, generation["poll_interval_seconds"], generation["poll_timeout_seconds"])  # type: ignore[union-attr]
     urls = collect_urls(result.get("output", result))
     image_url = choose_primary_url(urls, kind="image")
+    if image_url:
+        set_generation_cache(cache_key, generation["image_model"], task_id, image_url)
     return {"task_id": task_id, "url": image_url}
 
 
-def generate_scene_video(scene_id: str, dry_run: bool, submit_only: bool = False) -> Dict[str, str]:
-    scene = get_scene(scene_id)
+def generate_scene_video(
+    scene_id: str,
+    dry_run: bool,
+    submit_only: bool = False,
+    *,
+    scene: Optional[Dict[str, Any]] = None,
+    use_cache: bool = True,
+) -> Dict[str, str]:
+    if scene is None:
+        scene = get_scene(scene_id)
     if scene is None:
         raise DashboardError(f"Scene not found: {scene_id}")
     if not scene.get("image_url"):
@@ -3332,140 +4090,154 @@ def generate_scene_video(scene_id: str, dry_run: bool, submit_only: bool = False
         "generate_audio": generation["generate_audio"],
         "bgm": generation["bgm"],
     }
+    cache_key = generation_cache_key(generation["video_model"], payload)
+    if use_cache:
+        cached = get_generation_cache(cache_key)
+        if cached is not None:
+            return cached
     submit = client.submit_task(generation["video_model"], payload)
     task_id = extract_task_id(submit) or ""
     if submit_only:
+        if task_id:
+            set_generation_cache(cache_key, generation["video_model"], task_id, "")
         return {"task_id": task_id, "url": ""}
-    result = client.poll_task(task_id, generation["poll_interval_seconds"], generation["poll_timeout_seconds"])
+    result = client.poll_task_long(task_id, generation["poll_interval_seconds"], generation["poll_timeout_seconds"])
     urls = collect_urls(result.get("output", result))
     video_url = choose_primary_url(urls, kind="video")
+    if video_url:
+        set_generation_cache(cache_key, generation["video_model"], task_id, video_url)
     return {"task_id": task_id, "url": video_url}
 
 
-def run_scene_job(job_id: str, scene_id: str, stage: str, dry_run: bool) -> None:
+def complete_scene_job(job_id: str, scene_id: str, stage: str, result: Dict[str, str]) -> None:
+    scene_updates: Dict[str, Any] = {
+        f"{stage}_status": "completed",
+        f"{stage}_task_id": result["task_id"],
+        f"{stage}_url": result["url"],
+        "last_error": None,
+    }
+    if stage == "image":
+        scene_updates.update({"video_status": "pending", "video_task_id": None, "video_url": None})
+    update_scene_and_job_atomic(
+        scene_id,
+        scene_updates,
+        job_id,
+        {"status": "completed", "task_id": result["task_id"], "result_url": result["url"], "error": None},
+    )
+
+
+def run_scene_job(
+    job_id: str,
+    scene_id: str,
+    stage: str,
+    dry_run: bool,
+    *,
+    scene: Optional[Dict[str, Any]] = None,
+    character_url_override: Optional[str] = None,
+    use_cache: bool = True,
+) -> None:
     key = (scene_id, stage)
     try:
         if stage == "image":
-            result = generate_scene_image(scene_id, dry_run=dry_run)
-            update_scene_fields(
+            result = generate_scene_image(
                 scene_id,
-                {
-                    "image_status": "completed",
-                    "image_task_id": result["task_id"],
-                    "image_url": result["url"],
-                    "video_status": "pending",
-                    "video_task_id": None,
-                    "video_url": None,
-                    "last_error": None,
-                },
-            )
-            update_scene_job(
-                job_id,
-                status="completed",
-                task_id=result["task_id"],
-                result_url=result["url"],
-                error=None,
+                dry_run=dry_run,
+                submit_only=not dry_run,
+                scene=scene,
+                character_url_override=character_url_override,
+                use_cache=use_cache,
             )
-            try:
-                archive_dashboard_run(
-                    source="scene_image",
-                    mode="dry_run" if dry_run else "live",
-                    provider="auto",
-                )
-            except Exception:
-                pass
+            if not result["url"]:
+                mark_scene_job_submitted(job_id, scene_id, stage, result["task_id"])
+                ensure_scene_finalizer()
+                return
+            complete_scene_job(job_id, scene_id, stage, result)
+            schedule_dashboard_archive(source="scene_image", mode="dry_run" if dry_run else "live")
             return
 
         if stage == "video":
-            result = generate_scene_video(scene_id, dry_run=dry_run)
-            update_scene_fields(
-                scene_id,
-                {
-                    "video_status": "completed",
-                    "video_task_id": result["task_id"],
-                    "video_url": result["url"],
-                    "last_error": None,
-                },
+            result = generate_scene_video(
+                scene_id, dry_run=dry_run, submit_only=not dry_run, scene=scene, use_cache=use_cache
             )
-            update_scene_job(
-                job_id,
-                status="completed",
-                task_id=result["task_id"],
-                result_url=result["url"],
-                error=None,
-            )
-            try:
-                archive_dashboard_run(
-                    source="scene_video",
-                    mode="dry_run" if dry_run else "live",
-                    provider="auto",
-                )
-            except Exception:
-                pass
+            if not result["url"]:
+                mark_scene_job_submitted(job_id, scene_id, stage, result["task_id"])
+                ensure_scene_finalizer()
+                return
+            complete_scene_job(job_id, scene_id, stage, result)
+            schedule_dashboard_archive(source="scene_video", mode="dry_run" if dry_run else "live")
             return
 
         raise DashboardError(f"Unsupported stage: {stage}")
     except Exception as exc:  # noqa: BLE001
         msg = str(exc)
-        if stage == "image":
-            update_scene_fields(scene_id, {"image_status": "failed", "last_error": msg})
-        elif stage == "video":
-            update_scene_fields(scene_id, {"video_status": "failed", "last_error": msg})
-        update_scene_job(job_id, status="failed", error=msg)
-        try:
-            archive_dashboard_run(
-                source=f"{stage}_failed",
-                mode="dry_run" if dry_run else "live",
-                provider="auto",
-            )
-        except Exception:
-            pass
+        scene_updates: Dict[str, Any] = {}
+        if stage in {"image", "video"}:
+            scene_updates = {f"{stage}_status": "failed", "last_error": msg}
+        update_scene_and_job_atomic(scene_id, scene_updates, job_id, {"status": "failed", "error": msg})
+        schedule_dashboard_archive(source=f"{stage}_failed", mode="dry_run" if dry_run else "live")
     finally:
-        with ACTIVE_SCENE_LOCK:
-            ACTIVE_SCENE_JOBS.pop(key, None)
+        release_scene_job(key)
 
 
-def start_scene_job(scene_id: str, stage: str, dry_run: bool) -> Dict[str, Any]:
-    scene = get_scene(scene_id)
+def lock_for(key: Tuple[str, str]) -> threading.Lock:
+    return ACTIVE_SCENE_LOCKS[hash(key) & 15]
+
+
+def release_scene_job(key: Tuple[str, str]) -> None:
+    with lock_for(key):
+        ACTIVE_SCENE_JOBS.pop(key, None)
+
+
+def prepare_scene_job(
+    scene_id: str,
+    stage: str,
+    dry_run: bool,
+    *,
+    scene: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    # Batch callers already hold the scene row; only hit the DB when it was not passed in.
+    if scene is None:
+        scene = get_scene(scene_id)
     if scene is None:
         raise DashboardError(f"Scene not found: {scene_id}")
     if stage not in {"image", "video"}:
         raise DashboardError("stage must be image or video")
+    if stage == "video" and not scene.get("image_url"):
+        raise DashboardError("Cannot generate video before image is generated.")
 
     key = (scene_id, stage)
-    with ACTIVE_SCENE_LOCK:
+    serverless = is_serverless_runtime()
+    with lock_for(key):
         if key in ACTIVE_SCENE_JOBS:
             raise DashboardError(f"{stage} job already running for {scene_id}")
-    if is_serverless_runtime():
-        with db_conn() as conn:
-            row = conn.execute(
-                """
-                select id, task_id, requested_at from scene_jobs
-                where scene_id = ? and stage = ? and status = 'running'
-                order by requested_at desc
-                limit 1
-                """,
-                (scene_id, stage),
-            ).fetchone()
-        if row is not None:
-            existing_task_id = str(row["task_id"] or "").strip()
-            requested_at = parse_timestamp(row["requested_at"])
-            scene_status = str(scene.get(f"{stage}_status", "")).strip().lower()
-            stale_no_task = not existing_task_id and scene_status != "running"
-            stale_timeout = requested_at < (datetime.now(timezone.utc) - timedelta(minutes=30))
-            if stale_no_task or stale_timeout:
-                stale_reason = "stale timeout" if stale_timeout else "no task id"
-                update_scene_job(
-                    row["id"],
-                    status="failed",
-                    task_id=existing_task_id or None,
-                    error=f"Recovered stale running job ({stale_reason})",
-                )
-            else:
-                raise DashboardError(f"{stage} job already running for {scene_id}")
-
-    if stage == "video" and not scene.get("image_url"):
-        raise DashboardError("Cannot generate video before image is generated.")
+    # Live jobs outlive their worker once submitted, so the provider task in the DB is what marks them busy.
+    with db_conn() as conn:
+        row = conn.execute(
+            """
+            select id, task_id, requested_at from scene_jobs
+            where scene_id = ? and stage = ? and status = 'running'
+            order by requested_at desc
+            limit 1
+            """,
+            (scene_id, stage),
+        ).fetchone()
+    if row is not None:
+        existing_task_id = str(row["task_id"] or "").strip()
+        requested_at = parse_timestamp(row["requested_at"])
+        scene_status = str(scene.get(f"{stage}_status", "")).strip().lower()
+        # Outside serverless a job without a task id is only alive while it holds an active slot.
+        stale_no_task = not existing_task_id and (not serverless or scene_status != "running")
+        stale_timeout = requested_at < (datetime.now(timezone.utc) - timedelta(minutes=30))
+        if stale_no_task or stale_timeout:
+            stale_reason = "stale timeout" if stale_timeout else "no task id"
+            update_scene_job(
+                row["id"],
+                status="failed",
+                task_id=existing_task_id or None,
+                error=f"Recovered stale running job ({stale_reason})",
+            )
+        else:
+            raise DashboardError(f"{stage} job already running for {scene_id}")
 
     mode = "dry_run" if dry_run else "live"
     job_id = f"scene-{stage}-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:6]}"
@@ -3480,12 +4252,26 @@ def start_scene_job(scene_id: str, stage: str, dry_run: bool) -> Dict[str, Any]:
         "result_url": None,
         "error": None,
     }
-    insert_scene_job(record)
+    if not serverless:
+        # Reserve the slot now so concurrent launches for the same scene/stage cannot both pass.
+        with lock_for(key):
+            if key in ACTIVE_SCENE_JOBS:
+                raise DashboardError(f"{stage} job already running for {scene_id}")
+            ACTIVE_SCENE_JOBS[key] = {"job_id": job_id}
+    return scene, record
 
-    if stage == "image":
-        update_scene_fields(scene_id, {"image_status": "running", "last_error": None})
-    else:
-        update_scene_fields(scene_id, {"video_status": "running", "last_error": None})
+
+def dispatch_scene_job(
+    record: Dict[str, Any],
+    scene: Dict[str, Any],
+    dry_run: bool,
+    *,
+    character_url_override: Optional[str] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    job_id = record["id"]
+    scene_id = record["scene_id"]
+    stage = record["stage"]
 
     # Serverless runtimes are request-scoped, so background threads do not persist reliably.
     # Dry-run executes inline; live mode submits to provider and is reconciled on refresh.
@@ -3493,34 +4279,115 @@ def start_scene_job(scene_id: str, stage: str, dry_run: bool) -> Dict[str, Any]:
         if not dry_run:
             try:
                 if stage == "image":
-                    result = generate_scene_image(scene_id, dry_run=False, submit_only=True)
-                    update_scene_fields(scene_id, {"image_status": "running", "image_task_id": result["task_id"], "last_error": None})
+                    result = generate_scene_image(
+                        scene_id,
+                        dry_run=False,
+                        submit_only=True,
+                        scene=scene,
+                        character_url_override=character_url_override,
+                        use_cache=use_cache,
+                    )
+                else:
+                    result = generate_scene_video(
+                        scene_id, dry_run=False, submit_only=True, scene=scene, use_cache=use_cache
+                    )
+                if result["url"]:
+                    complete_scene_job(job_id, scene_id, stage, result)
                 else:
-                    result = generate_scene_video(scene_id, dry_run=False, submit_only=True)
-                    update_scene_fields(scene_id, {"video_status": "running", "video_task_id": result["task_id"], "last_error": None})
-                set_scene_job_task_id(job_id, result["task_id"])
+                    mark_scene_job_submitted(job_id, scene_id, stage, result["task_id"])
                 latest = get_scene_job(job_id)
                 return latest or record
             except Exception as exc:  # noqa: BLE001
                 msg = str(exc)
-                if stage == "image":
-                    update_scene_fields(scene_id, {"image_status": "failed", "last_error": msg})
-                else:
-                    update_scene_fields(scene_id, {"video_status": "failed", "last_error": msg})
-                update_scene_job(job_id, status="failed", error=msg)
+                update_scene_and_job_atomic(
+                    scene_id, {f"{stage}_status": "failed", "last_error": msg}, job_id, {"status": "failed", "error": msg}
+                )
                 raise DashboardError(msg)
 
-        run_scene_job(job_id, scene_id, stage, dry_run=True)
+        run_scene_job(
+            job_id,
+            scene_id,
+            stage,
+            dry_run=True,
+            scene=scene,
+            character_url_override=character_url_override,
+            use_cache=use_cache,
+        )
         latest = get_scene_job(job_id)
         return latest or record
 
-    thread = threading.Thread(target=run_scene_job, args=(job_id, scene_id, stage, dry_run), daemon=True)
-    with ACTIVE_SCENE_LOCK:
-        ACTIVE_SCENE_JOBS[key] = {"thread": thread, "job_id": job_id}
-    thread.start()
+    future = SCENE_EXECUTOR.submit(
+        run_scene_job,
+        job_id,
+        scene_id,
+        stage,
+        dry_run,
+        scene=scene,
+        character_url_override=character_url_override,
+        use_cache=use_cache,
+    )
+    with lock_for((scene_id, stage)):
+        entry = ACTIVE_SCENE_JOBS.get((scene_id, stage))
+        if entry is not None and entry.get("job_id") == job_id:
+            entry["future"] = future
     return record
 
 
+def start_scene_job(
+    scene_id: str,
+    stage: str,
+    dry_run: bool,
+    *,
+    scene: Optional[Dict[str, Any]] = None,
+    character_url_override: Optional[str] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    scene, record = prepare_scene_job(scene_id, stage, dry_run, scene=scene)
+    try:
+        insert_scene_jobs_bulk([record])
+    except Exception:
+        release_scene_job((scene_id, stage))
+        raise
+    return dispatch_scene_job(
+        record, scene, dry_run, character_url_override=character_url_override, use_cache=use_cache
+    )
+
+
+def launch_scene_jobs(
+    scenes: List[Dict[str, Any]], stage: str, dry_run: bool, **kwargs: Any
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+    launched: List[Dict[str, Any]] = []
+    errors: List[Dict[str, str]] = []
+    prepared: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    for scene in scenes:
+        try:
+            prepared.append(prepare_scene_job(scene["scene_id"], stage, dry_run, scene=scene))
+        except Exception as exc:  # noqa: BLE001
+            errors.append({"scene_id": scene["scene_id"], "error": str(exc)})
+    if not prepared:
+        return launched, errors
+
+    try:
+        insert_scene_jobs_bulk([record for _, record in prepared])
+    except Exception:
+        for _, record in prepared:
+            release_scene_job((record["scene_id"], stage))
+        raise
+
+    # Serverless live launches submit to the provider inline; fan them out so a batch costs
+    # roughly one round-trip instead of one per scene. Results keep the input order.
+    with ThreadPoolExecutor(max_workers=min(BATCH_SUBMIT_WORKERS, len(prepared))) as pool:
+        futures = [
+            pool.submit(dispatch_scene_job, record, scene, dry_run, **kwargs) for scene, record in prepared
+        ]
+        for (scene, _), future in zip(prepared, futures):
+            try:
+                launched.append(future.result())
+            except Exception as exc:  # noqa: BLE001
+                errors.append({"scene_id": scene["scene_id"], "error": str(exc)})
+    return launched, errors
+
+
 def start_trigger_job(dry_run: bool, provider: str) -> Dict[str, Any]:
     reconcile_trigger_jobs()
     job_id = f"trigger-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:6]}"
@@ -3548,13 +4415,17 @@ def start_trigger_job(dry_run: bool, provider: str) -> Dict[str, Any]:
         )
 
     env = os.environ.copy()
+    # bootstrap_once already exported ROOT/.env, which is the file the trigger would read.
+    env["APRT_ENV_LOADED"] = "1"
     log_handle = log_path.open("a", encoding="utf-8")
     proc = subprocess.Popen(  # noqa: S603
         cmd,
         cwd=str(ROOT),
+        stdin=subprocess.DEVNULL,
         stdout=log_handle,
         stderr=subprocess.STDOUT,
         env=env,
+        close_fds=True,
     )
 
     with ACTIVE_TRIGGER_LOCK:
@@ -3573,6 +4444,7 @@ def start_trigger_job(dry_run: bool, provider: str) -> Dict[str, Any]:
         "log_path": str(log_path.resolve()),
     }
     insert_trigger_job(job_record)
+    invalidate_ttl_caches()
     return job_record
 
 
@@ -3624,8 +4496,11 @@ def api_overview() -> Any:
             "runtime": {
                 "serverless": is_serverless_runtime(),
                 "wavespeed_configured": bool(os.getenv("WAVESPEED_API_KEY", "").strip()),
+                "scene_job_workers": SCENE_JOB_WORKERS,
                 "supabase_configured": bool(get_supabase_project_id() and get_supabase_service_key()),
                 "airtable_configured": bool(get_airtable_token()),
+                "scene_jobs_running": count_running_scene_jobs(),
+                "scene_jobs_idle_seconds": min(scene_job_idle_seconds(), 86400.0),
             },
             "active_trigger_jobs": len(ACTIVE_TRIGGER_JOBS),
             "active_scene_jobs": len(ACTIVE_SCENE_JOBS),
@@ -3689,7 +4564,7 @@ def api_update_scene(scene_id: str) -> Any:
             }
         )
 
-    updated = update_scene_fields(scene_id, updates)
+    updated = update_scene_fields(scene_id, updates, current=scene)
     return jsonify({"scene": updated})
 
 
@@ -3698,10 +4573,11 @@ def api_generate_scene_image(scene_id: str) -> Any:
     bootstrap_once()
     payload = request.get_json(silent=True) or {}
     dry_run = bool(payload.get("dry_run", False))
+    use_cache = bool(payload.get("use_cache", True))
     provider = str(payload.get("provider", "auto")).strip().lower() or "auto"
     try:
         preflight_character_for_scene_images(dry_run=dry_run)
-        job = start_scene_job(scene_id, stage="image", dry_run=dry_run)
+        job = start_scene_job(scene_id, stage="image", dry_run=dry_run, use_cache=use_cache)
     except DashboardError as exc:
         return jsonify({"error": str(exc)}), 400
     archive = None
@@ -3721,9 +4597,10 @@ def api_generate_scene_video(scene_id: str) -> Any:
     bootstrap_once()
     payload = request.get_json(silent=True) or {}
     dry_run = bool(payload.get("dry_run", False))
+    use_cache = bool(payload.get("use_cache", True))
     provider = str(payload.get("provider", "auto")).strip().lower() or "auto"
     try:
-        job = start_scene_job(scene_id, stage="video", dry_run=dry_run)
+        job = start_scene_job(scene_id, stage="video", dry_run=dry_run, use_cache=use_cache)
     except DashboardError as exc:
         return jsonify({"error": str(exc)}), 400
     archive = None
@@ -3743,28 +4620,21 @@ def api_generate_images_batch() -> Any:
     bootstrap_once()
     payload = request.get_json(silent=True) or {}
     dry_run = bool(payload.get("dry_run", False))
+    use_cache = bool(payload.get("use_cache", True))
     only_missing = bool(payload.get("only_missing", True))
     provider = str(payload.get("provider", "auto")).strip().lower() or "auto"
     scene_ids_raw = payload.get("scene_ids", [])
 
-    scenes = list_scenes()
-    if isinstance(scene_ids_raw, list) and scene_ids_raw:
-        wanted = {str(item) for item in scene_ids_raw}
-        scenes = [scene for scene in scenes if scene["scene_id"] in wanted]
+    scene_ids = scene_ids_raw if isinstance(scene_ids_raw, list) and scene_ids_raw else None
+    pending = list_scenes(scene_ids, missing_stage="image" if only_missing else None)
 
-    launched = []
-    errors = []
     try:
-        preflight_character_for_scene_images(dry_run=dry_run)
+        character_url = preflight_character_for_scene_images(dry_run=dry_run) or None
     except DashboardError as exc:
         return jsonify({"launched": [], "errors": [{"scene_id": "__character__", "error": str(exc)}]}), 400
-    for scene in scenes:
-        if only_missing and scene.get("image_status") == "completed" and scene.get("image_url"):
-            continue
-        try:
-            launched.append(start_scene_job(scene["scene_id"], stage="image", dry_run=dry_run))
-        except Exception as exc:  # noqa: BLE001
-            errors.append({"scene_id": scene["scene_id"], "error": str(exc)})
+    launched, errors = launch_scene_jobs(
+        pending, "image", dry_run, character_url_override=character_url, use_cache=use_cache
+    )
 
     archive = None
     try:
@@ -3783,26 +4653,15 @@ def api_generate_videos_batch() -> Any:
     bootstrap_once()
     payload = request.get_json(silent=True) or {}
     dry_run = bool(payload.get("dry_run", False))
+    use_cache = bool(payload.get("use_cache", True))
     only_missing = bool(payload.get("only_missing", True))
     provider = str(payload.get("provider", "auto")).strip().lower() or "auto"
     scene_ids_raw = payload.get("scene_ids", [])
 
-    scenes = list_scenes()
-    if isinstance(scene_ids_raw, list) and scene_ids_raw:
-        wanted = {str(item) for item in scene_ids_raw}
-        scenes = [scene for scene in scenes if scene["scene_id"] in wanted]
-
-    launched = []
-    errors = []
-    for scene in scenes:
-        if not scene.get("image_url"):
-            continue
-        if only_missing and scene.get("video_status") == "completed" and scene.get("video_url"):
-            continue
-        try:
-            launched.append(start_scene_job(scene["scene_id"], stage="video", dry_run=dry_run))
-        except Exception as exc:  # noqa: BLE001
-            errors.append({"scene_id": scene["scene_id"], "error": str(exc)})
+    scene_ids = scene_ids_raw if isinstance(scene_ids_raw, list) and scene_ids_raw else None
+    scenes = list_scenes(scene_ids, missing_stage="video" if only_missing else None)
+    pending = [scene for scene in scenes if scene.get("image_url")]
+    launched, errors = launch_scene_jobs(pending, "video", dry_run, use_cache=use_cache)
 
     archive = None
     try:
@@ -3823,6 +4682,60 @@ def api_scene_jobs() -> Any:
     return jsonify({"jobs": list_scene_jobs()})
 
 
+def scene_job_events(job_ids: List[str]) -> Iterator[str]:
+    # One stream covers a whole batch: a single reconcile per tick, one event per changed job.
+    started = time.monotonic()
+    delay = POLL_BACKOFF_START_SECONDS
+    last: Dict[str, Dict[str, Any]] = {}
+    pending = list(job_ids)
+    while pending and time.monotonic() - started < SCENE_JOB_STREAM_MAX_SECONDS:
+        if is_serverless_runtime():
+            # No background worker here; the stream drives the provider refresh.
+            reconcile_provider_jobs()
+        changed = False
+        for job_id in list(pending):
+            job = get_scene_job(job_id)
+            if job is not None and job != last.get(job_id):
+                last[job_id] = job
+                changed = True
+                yield f"data: {json_dumps(job)}\n\n"
+            if job is None or job.get("status") != "running":
+                pending.remove(job_id)
+                yield f"event: done\ndata: {json_dumps({'id': job_id})}\n\n"
+        if not pending:
+            return
+        if changed:
+            delay = POLL_BACKOFF_START_SECONDS
+        else:
+            yield ": ping\n\n"
+        time.sleep(delay)
+        delay = min(SCENE_JOB_STREAM_MAX_DELAY_SECONDS, delay * 1.5)
+
+
+def scene_job_stream_response(job_ids: List[str]) -> Response:
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(stream_with_context(scene_job_events(job_ids)), headers=headers, mimetype="text/event-stream")
+
+
+@app.get("/api/scene-jobs/stream")
+def api_scene_jobs_stream() -> Any:
+    bootstrap_once()
+    ids_raw = str(request.args.get("ids", "") or "")
+    job_ids = list(dict.fromkeys(item.strip() for item in ids_raw.split(",") if item.strip()))
+    job_ids = [job_id for job_id in job_ids[:SCENE_JOB_STREAM_MAX_IDS] if get_scene_job(job_id) is not None]
+    if not job_ids:
+        return jsonify({"error": "no matching scene jobs"}), 404
+    return scene_job_stream_response(job_ids)
+
+
+@app.get("/api/scene-jobs/<job_id>/stream")
+def api_scene_job_stream(job_id: str) -> Any:
+    bootstrap_once()
+    if get_scene_job(job_id) is None:
+        return jsonify({"error": "scene job not found"}), 404
+    return scene_job_stream_response([job_id])
+
+
 @app.get("/api/character")
 def api_character() -> Any:
     bootstrap_once()
@@ -4090,7 +5003,13 @@ def api_scene_asset_download(scene_id: str, asset_kind: str) -> Any:
     if is_simulated_url(url):
         return jsonify({"error": "Dry-run assets are simulated and cannot be downloaded"}), 400
 
-    ext_guess = mimetypes.guess_extension(mimetypes.guess_type(url)[0] or "") or (".png" if normalized == "image" else ".mp4")
+    ext_match = EXT_FROM_URL_RE.search(url)
+    if ext_match:
+        ext_guess = ".jpg" if ext_match.group(1).lower() == "jpeg" else f".{ext_match.group(1).lower()}"
+    else:
+        ext_guess = mimetypes.guess_extension(mimetypes.guess_type(url)[0] or "") or (
+            ".png" if normalized == "image" else ".mp4"
+        )
     safe_ext = ".bin" if ext_guess == ".jpe" else ext_guess
     download_name = f"{scene_id}_{normalized}{safe_ext}"
     try:
@@ -52,6 +52,16 @@ const textModalTitle = document.getElementById("textModalTitle");
 
 let selectedTriggerJobId = null;
 let pollInFlight = false;
+let pollTimer = null;
+let pollDelayMs = 8000;
+let jobsInFlight = false;
+const POLL_BASE_MS = 8000;
+const POLL_MAX_MS = 60000;
+const SCENE_JOB_STREAM_MAX_IDS = 100;
+const sceneJobStreamIds = new Set();
+let sceneJobStream = null;
+let sceneJobStreamTimer = null;
+let streamRefreshTimer = null;
 let warnedNoWaveSpeed = false;
 let activeExpandedTextarea = null;
 let registrySearchTerm = "";
@@ -723,11 +733,12 @@ function attachSceneEntryHandlers(entries) {
 
     imageBtn?.addEventListener("click", async () => {
       try {
-        await requestJson(`/api/scenes/${encodeURIComponent(sceneId)}/generate-image`, {
+        const data = await requestJson(`/api/scenes/${encodeURIComponent(sceneId)}/generate-image`, {
           method: "POST",
           headers: { "Content-Type": "application/json" },
           body: JSON.stringify({ dry_run: isDryRun(), provider: providerSelect.value }),
         });
+        watchSceneJob(data.job);
         showToast(`Image job started for ${sceneId}${isDryRun() ? " (dry simulation)" : " (live WaveSpeed)"}`);
         await Promise.all([refreshSceneJobs(), refreshScenes(), refreshCharacter()]);
       } catch (err) {
@@ -737,11 +748,12 @@ function attachSceneEntryHandlers(entries) {
 
     videoBtn?.addEventListener("click", async () => {
       try {
-        await requestJson(`/api/scenes/${encodeURIComponent(sceneId)}/generate-video`, {
+        const data = await requestJson(`/api/scenes/${encodeURIComponent(sceneId)}/generate-video`, {
           method: "POST",
           headers: { "Content-Type": "application/json" },
           body: JSON.stringify({ dry_run: isDryRun(), provider: providerSelect.value }),
         });
+        watchSceneJob(data.job);
         showToast(`Video job started for ${sceneId}${isDryRun() ? " (dry simulation)" : " (live WaveSpeed)"}`);
         await Promise.all([refreshSceneJobs(), refreshScenes()]);
       } catch (err) {
@@ -1021,6 +1033,7 @@ async function refreshScenes() {
 async function refreshSceneJobs() {
   const data = await requestJson("/api/scene-jobs");
   renderSceneJobs(data);
+  return (data.jobs || []).some((job) => job.status === "running");
 }
 
 async function refreshRuns() {
@@ -1031,6 +1044,7 @@ async function refreshRuns() {
 async function refreshTriggerJobs() {
   const data = await requestJson("/api/jobs");
   renderTriggerJobs(data);
+  return (data.jobs || []).some((job) => job.status === "running");
 }
 
 async function refreshCharacter() {
@@ -1203,6 +1217,7 @@ genAllImagesBtn.addEventListener("click", async () => {
       body: JSON.stringify({ dry_run: isDryRun(), only_missing: true, provider: providerSelect.value }),
     });
     const count = (data.launched || []).length;
+    (data.launched || []).forEach(watchSceneJob);
     showToast(`Started ${count} image jobs${isDryRun() ? " (dry simulation)" : " (live WaveSpeed)"}`);
     await Promise.all([refreshSceneJobs(), refreshScenes(), refreshCharacter()]);
   } catch (err) {
@@ -1218,6 +1233,7 @@ genAllVideosBtn.addEventListener("click", async () => {
       body: JSON.stringify({ dry_run: isDryRun(), only_missing: true, provider: providerSelect.value }),
     });
     const count = (data.launched || []).length;
+    (data.launched || []).forEach(watchSceneJob);
     showToast(`Started ${count} video jobs${isDryRun() ? " (dry simulation)" : " (live WaveSpeed)"}`);
     await Promise.all([refreshSceneJobs(), refreshScenes()]);
   } catch (err) {
@@ -1337,17 +1353,91 @@ document.addEventListener("keydown", (event) => {
 
 initializeLongTextEditors();
 refreshAll();
-setInterval(async () => {
-  if (document.hidden || pollInFlight) return;
-  pollInFlight = true;
+function isEditingSceneCell() {
   const active = document.activeElement;
-  const editing = active && active.tagName === "TEXTAREA" && active.classList.contains("cell-editor");
+  return Boolean(active && active.tagName === "TEXTAREA" && active.classList.contains("cell-editor"));
+}
+
+function scheduleStreamRefresh() {
+  if (streamRefreshTimer) return;
+  streamRefreshTimer = setTimeout(async () => {
+    streamRefreshTimer = null;
+    try {
+      await refreshSceneJobs();
+      if (!isEditingSceneCell()) {
+        await refreshScenes();
+      }
+    } catch (err) {
+      console.error(err);
+    }
+  }, 250);
+}
+
+function watchSceneJob(job) {
+  // Falls back to the regular poll loop when SSE is unavailable or the shared stream is full.
+  if (!window.EventSource || !job?.id || job.status !== "running" || sceneJobStreamIds.has(job.id)) return;
+  if (sceneJobStreamIds.size >= SCENE_JOB_STREAM_MAX_IDS) return;
+  sceneJobStreamIds.add(job.id);
+  // Batch launches add many ids at once; reopen the shared stream once they have all been added.
+  if (!sceneJobStreamTimer) {
+    sceneJobStreamTimer = setTimeout(openSceneJobStream, 0);
+  }
+}
+
+function closeSceneJobStream() {
+  if (sceneJobStream) {
+    sceneJobStream.close();
+    sceneJobStream = null;
+  }
+}
+
+function openSceneJobStream() {
+  sceneJobStreamTimer = null;
+  closeSceneJobStream();
+  if (!sceneJobStreamIds.size) return;
+  const ids = [...sceneJobStreamIds].map(encodeURIComponent).join(",");
+  const source = new EventSource(`/api/scene-jobs/stream?ids=${ids}`);
+  sceneJobStream = source;
+  source.onmessage = scheduleStreamRefresh;
+  source.addEventListener("done", (event) => {
+    try {
+      sceneJobStreamIds.delete(JSON.parse(event.data).id);
+    } catch (err) {
+      console.error(err);
+    }
+    if (!sceneJobStreamIds.size) closeSceneJobStream();
+    scheduleStreamRefresh();
+  });
+  source.onerror = () => {
+    closeSceneJobStream();
+    sceneJobStreamIds.clear();
+  };
+}
+
+function schedulePoll(delayMs) {
+  if (pollTimer) clearTimeout(pollTimer);
+  pollTimer = setTimeout(pollOnce, delayMs);
+}
+
+function resetPollBackoff() {
+  if (pollDelayMs === POLL_BASE_MS) return;
+  pollDelayMs = POLL_BASE_MS;
+  schedulePoll(pollDelayMs);
+}
+
+async function pollOnce() {
+  if (document.hidden || pollInFlight) {
+    schedulePoll(pollDelayMs);
+    return;
+  }
+  pollInFlight = true;
   try {
-    if (!editing) {
+    if (!isEditingSceneCell()) {
       await refreshScenes();
     }
-    await refreshSceneJobs();
-    await refreshTriggerJobs();
+    const sceneJobsRunning = await refreshSceneJobs();
+    const triggerJobsRunning = await refreshTriggerJobs();
+    jobsInFlight = sceneJobsRunning || triggerJobsRunning;
     await refreshRuns();
     await refreshCharacter();
     await refreshCharacterConfig();
@@ -1357,5 +1447,13 @@ setInterval(async () => {
     console.error(err);
   } finally {
     pollInFlight = false;
+    // Back off while nothing is running; snap back as soon as work or user activity shows up.
+    pollDelayMs = jobsInFlight ? POLL_BASE_MS : Math.min(POLL_MAX_MS, Math.round(pollDelayMs * 1.5));
+    schedulePoll(pollDelayMs);
   }
-}, 8000);
+}
+
+["click", "keydown", "visibilitychange"].forEach((eventName) => {
+  document.addEventListener(eventName, resetPollBackoff);
+});
+schedulePoll(POLL_BASE_MS);
@@ -4,24 +4,78 @@
 from __future__ import annotations
 
 import argparse
+import gzip
 import hashlib
 import json
 import os
 import pathlib
 import time
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+# PostgREST accepts JSON arrays; chunk to stay well under its request body limit.
+SUPABASE_BATCH_SIZE = 500
+
+
+def build_session() -> requests.Session:
+    # Both writes are idempotent (merge-duplicates upsert, fixed Cloudinary public_id), so POSTs may retry.
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=16, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+SESSION = build_session()
+ENV_FILES_LOADED: Dict[str, int] = {}
 
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
 
+def json_body(value: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            pass
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def json_loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
 def load_env_file(path: pathlib.Path) -> None:
-    if not path.exists():
+    # Parents that already exported .env (the dashboard's trigger launch) set APRT_ENV_LOADED.
+    if os.environ.get("APRT_ENV_LOADED"):
+        return
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
         return
+    if ENV_FILES_LOADED.get(str(path)) == mtime_ns:
+        return
+    ENV_FILES_LOADED[str(path)] = mtime_ns
     for raw in path.read_text(encoding="utf-8").splitlines():
         line = raw.strip()
         if not line or line.startswith("#") or "=" not in line:
@@ -33,65 +87,106 @@ def load_env_file(path: pathlib.Path) -> None:
             os.environ[key] = value
 
 
-def transfer_supabase(payload: Dict[str, Any], table: str, dry_run: bool) -> Dict[str, Any]:
-    project_id = os.getenv("SUPABASE_PROJECT_ID", "")
-    service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
-    if not project_id or not service_key:
-        return {
-            "provider": "supabase",
-            "status": "failed",
-            "destination": table,
-            "message": "Missing SUPABASE_PROJECT_ID or SUPABASE_SERVICE_ROLE_KEY.",
-        }
-
-    endpoint = f"https://{project_id}.supabase.co/rest/v1/{table}"
-    row = {
+def supabase_row(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
         "run_id": payload.get("run_id"),
         "story_id": payload.get("story_id"),
         "status": payload.get("status"),
         "generated_at": payload.get("run", {}).get("ended_at") or utc_now_iso(),
         "payload": payload,
     }
+
+
+def transfer_supabase_many(
+    payloads: List[Dict[str, Any]], table: str, dry_run: bool, compress: bool = False
+) -> List[Dict[str, Any]]:
+    project_id = os.getenv("SUPABASE_PROJECT_ID", "")
+    service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
+    if not project_id or not service_key:
+        return [
+            {
+                "provider": "supabase",
+                "status": "failed",
+                "destination": table,
+                "message": "Missing SUPABASE_PROJECT_ID or SUPABASE_SERVICE_ROLE_KEY.",
+            }
+            for _ in payloads
+        ]
+
+    endpoint = f"https://{project_id}.supabase.co/rest/v1/{table}"
     headers = {
         "apikey": service_key,
         "Authorization": f"Bearer {service_key}",
         "Content-Type": "application/json",
         "Prefer": "return=representation,resolution=merge-duplicates",
     }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
 
     if dry_run:
-        return {
-            "provider": "supabase",
-            "status": "success",
-            "destination": endpoint,
-            "message": "Dry run only; no network write performed.",
-        }
+        return [
+            {
+                "provider": "supabase",
+                "status": "success",
+                "destination": endpoint,
+                "message": "Dry run only; no network write performed.",
+            }
+            for _ in payloads
+        ]
+
+    results: List[Dict[str, Any]] = []
+    for offset in range(0, len(payloads), SUPABASE_BATCH_SIZE):
+        chunk = payloads[offset : offset + SUPABASE_BATCH_SIZE]
+        rows = [supabase_row(payload) for payload in chunk]
+        body = json_body(rows)
+        if compress:
+            body = gzip.compress(body, compresslevel=1)
+        response = SESSION.post(endpoint, headers=headers, data=body, timeout=90)
+        if not response.ok:
+            message = response.text.strip()[:1000]
+            results.extend(
+                {
+                    "provider": "supabase",
+                    "status": "failed",
+                    "destination": endpoint,
+                    "message": f"Supabase write failed ({response.status_code}): {message}",
+                }
+                for _ in chunk
+            )
+            continue
+        inserted = response.json()
+        records = inserted if isinstance(inserted, list) and len(inserted) == len(chunk) else [inserted] * len(chunk)
+        results.extend(
+            {
+                "provider": "supabase",
+                "status": "success",
+                "destination": endpoint,
+                "message": "Payload inserted/upserted to Supabase.",
+                "record": record,
+            }
+            for record in records
+        )
+    return results
 
-    response = requests.post(endpoint, headers=headers, json=[row], timeout=90)
-    if not response.ok:
-        message = response.text.strip()[:1000]
-        return {
-            "provider": "supabase",
-            "status": "failed",
-            "destination": endpoint,
-            "message": f"Supabase write failed ({response.status_code}): {message}",
-        }
-    inserted = response.json()
-    return {
-        "provider": "supabase",
-        "status": "success",
-        "destination": endpoint,
-        "message": "Payload inserted/upserted to Supabase.",
-        "record": inserted[0] if isinstance(inserted, list) and inserted else inserted,
-    }
+
+def transfer_supabase(payload: Dict[str, Any], table: str, dry_run: bool, compress: bool = False) -> Dict[str, Any]:
+    return transfer_supabase_many([payload], table=table, dry_run=dry_run, compress=compress)[0]
 
 
-def cloudinary_signature(params: Dict[str, Any], api_secret: str) -> str:
-    flattened = "&".join(f"{key}={params[key]}" for key in sorted(params.keys()))
-    return hashlib.sha1(f"{flattened}{api_secret}".encode("utf-8")).hexdigest()
+def cloudinary_signature(folder: str, public_id: str, timestamp: int, api_secret: str) -> str:
+    # Signed params are always these three, already in Cloudinary's alphabetical order.
+    return hashlib.sha1(
+        f"folder={folder}&public_id={public_id}&timestamp={timestamp}{api_secret}".encode("utf-8")
+    ).hexdigest()
 
 
-def transfer_cloudinary(payload: Dict[str, Any], folder: str, dry_run: bool) -> Dict[str, Any]:
+def transfer_cloudinary(
+    payload: Dict[str, Any],
+    folder: str,
+    dry_run: bool,
+    payload_path: Optional[pathlib.Path] = None,
+    compress: bool = False,
+) -> Dict[str, Any]:
     cloud_name = os.getenv("CLOUDINARY_CLOUD_NAME", "")
     api_key = os.getenv("CLOUDINARY_API_KEY", "")
     api_secret = os.getenv("CLOUDINARY_API_SECRET", "")
@@ -105,6 +200,8 @@ def transfer_cloudinary(payload: Dict[str, Any], folder: str, dry_run: bool) ->
 
     run_id = payload.get("run_id", "unknown")
     public_id = f"{folder.strip('/').replace('/', '_')}_{run_id}"
+    if compress:
+        public_id = f"{public_id}.json.gz"
     endpoint = f"https://api.cloudinary.com/v1_1/{cloud_name}/raw/upload"
 
     if dry_run:
@@ -116,8 +213,7 @@ def transfer_cloudinary(payload: Dict[str, Any], folder: str, dry_run: bool) ->
         }
 
     timestamp = int(time.time())
-    sign_params = {"folder": folder, "public_id": public_id, "timestamp": timestamp}
-    signature = cloudinary_signature(sign_params, api_secret)
+    signature = cloudinary_signature(folder, public_id, timestamp, api_secret)
     data = {
         "api_key": api_key,
         "timestamp": timestamp,
@@ -125,10 +221,18 @@ def transfer_cloudinary(payload: Dict[str, Any], folder: str, dry_run: bool) ->
         "public_id": public_id,
         "signature": signature,
     }
-    payload_bytes = json.dumps(payload, ensure_ascii=True).encode("utf-8")
-    files = {"file": (f"{run_id}.json", payload_bytes, "application/json")}
-
-    response = requests.post(endpoint, data=data, files=files, timeout=90)
+    if compress:
+        raw = payload_path.read_bytes() if payload_path is not None else json_body(payload)
+        files = {"file": (f"{run_id}.json.gz", gzip.compress(raw, compresslevel=1), "application/gzip")}
+        response = SESSION.post(endpoint, data=data, files=files, timeout=90)
+    elif payload_path is not None:
+        # Upload the payload file as written on disk instead of re-serializing it in memory.
+        with payload_path.open("rb") as handle:
+            files = {"file": (f"{run_id}.json", handle, "application/json")}
+            response = SESSION.post(endpoint, data=data, files=files, timeout=90)
+    else:
+        files = {"file": (f"{run_id}.json", json_body(payload), "application/json")}
+        response = SESSION.post(endpoint, data=data, files=files, timeout=90)
     if not response.ok:
         message = response.text.strip()[:1000]
         return {
@@ -148,12 +252,23 @@ def transfer_cloudinary(payload: Dict[str, Any], folder: str, dry_run: bool) ->
 
 
 def write_json(path: pathlib.Path, payload: Dict[str, Any]) -> None:
-    path.write_text(json.dumps(payload, indent=2, ensure_ascii=True), encoding="utf-8")
+    if orjson is not None:
+        try:
+            path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+            return
+        except TypeError:
+            pass
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Cloud transfer for APRT payload artifacts.")
-    parser.add_argument("--payload", required=True, help="Path to payload JSON file.")
+    parser.add_argument(
+        "--payload",
+        action="append",
+        required=True,
+        help="Path to payload JSON file. Repeat to transfer several payloads in one batch.",
+    )
     parser.add_argument(
         "--provider",
         choices=["auto", "supabase", "cloudinary"],
@@ -170,67 +285,112 @@ def parse_args() -> argparse.Namespace:
         default="aprt/payloads",
         help="Cloudinary folder for raw payload uploads.",
     )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        default=os.getenv("CLOUD_TRANSFER_GZIP", "").strip().lower() in {"1", "true", "yes", "on"},
+        help="Gzip upload bodies (Supabase Content-Encoding, Cloudinary .json.gz). Also CLOUD_TRANSFER_GZIP=1.",
+    )
     parser.add_argument("--dry-run", action="store_true", help="Skip network writes.")
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def main() -> int:
-    args = parse_args()
-    load_env_file(pathlib.Path(".env").resolve())
-
-    payload_path = pathlib.Path(args.payload).expanduser().resolve()
-    if not payload_path.exists():
-        raise SystemExit(f"Payload file does not exist: {payload_path}")
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    payload_paths = [pathlib.Path(item).expanduser().resolve() for item in args.payload]
+    for payload_path in payload_paths:
+        if not payload_path.exists():
+            raise SystemExit(f"Payload file does not exist: {payload_path}")
 
-    payload = json.loads(payload_path.read_text(encoding="utf-8"))
+    payloads = [json_loads(payload_path.read_bytes()) for payload_path in payload_paths]
     provider = args.provider
+    dry_run = bool(args.dry_run)
+    compress = bool(args.gzip)
 
-    result: Optional[Dict[str, Any]] = None
-    primary_result: Optional[Dict[str, Any]] = None
+    results: List[Optional[Dict[str, Any]]] = [None] * len(payloads)
     if provider in {"auto", "supabase"}:
-        table = args.supabase_table
-        if isinstance(payload.get("output"), dict) and payload["output"].get("supabase_table"):
-            table = payload["output"]["supabase_table"]
-        primary_result = transfer_supabase(payload, table=table, dry_run=bool(args.dry_run))
-        result = primary_result
-        if provider == "supabase" or (result and result.get("status") == "success"):
-            pass
-        else:
-            fallback = transfer_cloudinary(payload, folder=args.cloudinary_folder, dry_run=bool(args.dry_run))
-            if fallback.get("status") == "success" and primary_result:
-                fallback["message"] = (
-                    f"{fallback.get('message', 'Cloudinary fallback success')} "
-                    f"(Supabase fallback reason: {primary_result.get('message', 'unknown')})"
+        by_table: Dict[str, List[int]] = {}
+        for index, payload in enumerate(payloads):
+            table = args.supabase_table
+            if isinstance(payload.get("output"), dict) and payload["output"].get("supabase_table"):
+                table = payload["output"]["supabase_table"]
+            by_table.setdefault(table, []).append(index)
+        for table, indexes in by_table.items():
+            batch = transfer_supabase_many(
+                [payloads[index] for index in indexes], table=table, dry_run=dry_run, compress=compress
+            )
+            for index, primary_result in zip(indexes, batch):
+                results[index] = primary_result
+
+        if provider == "auto":
+            for index, primary_result in enumerate(results):
+                if primary_result and primary_result.get("status") == "success":
+                    continue
+                fallback = transfer_cloudinary(
+                    payloads[index],
+                    folder=args.cloudinary_folder,
+                    dry_run=dry_run,
+                    payload_path=payload_paths[index],
+                    compress=compress,
                 )
-                fallback["fallback_from"] = primary_result
-            result = fallback
+                if fallback.get("status") == "success" and primary_result:
+                    fallback["message"] = (
+                        f"{fallback.get('message', 'Cloudinary fallback success')} "
+                        f"(Supabase fallback reason: {primary_result.get('message', 'unknown')})"
+                    )
+                    fallback["fallback_from"] = primary_result
+                results[index] = fallback
     elif provider == "cloudinary":
-        result = transfer_cloudinary(payload, folder=args.cloudinary_folder, dry_run=bool(args.dry_run))
-
-    if not result:
-        result = {
-            "provider": "unknown",
-            "status": "failed",
-            "destination": None,
-            "message": "No provider result produced.",
+        results = [
+            transfer_cloudinary(
+                payload,
+                folder=args.cloudinary_folder,
+                dry_run=dry_run,
+                payload_path=payload_path,
+                compress=compress,
+            )
+            for payload_path, payload in zip(payload_paths, payloads)
+        ]
+
+    summaries = []
+    for payload_path, payload, result in zip(payload_paths, payloads, results):
+        if not result:
+            result = {
+                "provider": "unknown",
+                "status": "failed",
+                "destination": None,
+                "message": "No provider result produced.",
+            }
+
+        cloud_transfer = {
+            "provider": result.get("provider"),
+            "status": result.get("status"),
+            "destination": result.get("destination"),
+            "message": result.get("message"),
+            "transferred_at": utc_now_iso(),
         }
+        payload["cloud_transfer"] = cloud_transfer
+        if result.get("status") != "success":
+            payload.setdefault("errors", []).append(
+                {"stage": "cloud_transfer", "message": result.get("message", "Cloud transfer failed")}
+            )
 
-    cloud_transfer = {
-        "provider": result.get("provider"),
-        "status": result.get("status"),
-        "destination": result.get("destination"),
-        "message": result.get("message"),
-        "transferred_at": utc_now_iso(),
-    }
-    payload["cloud_transfer"] = cloud_transfer
-    if result.get("status") != "success":
-        payload.setdefault("errors", []).append(
-            {"stage": "cloud_transfer", "message": result.get("message", "Cloud transfer failed")}
-        )
+        write_json(payload_path, payload)
+        summaries.append({"payload_path": str(payload_path), "cloud_transfer": cloud_transfer})
+
+    return summaries[0] if len(summaries) == 1 else {"transfers": summaries}
+
+
+def transfer_succeeded(output: Dict[str, Any]) -> bool:
+    summaries = output.get("transfers", [output])
+    return all(item.get("cloud_transfer", {}).get("status") == "success" for item in summaries)
 
-    write_json(payload_path, payload)
-    print(json.dumps({"payload_path": str(payload_path), "cloud_transfer": cloud_transfer}, indent=2))
-    return 0 if result.get("status") == "success" else 1
+
+def main() -> int:
+    args = parse_args()
+    load_env_file(pathlib.Path(".env").resolve())
+    output = run(args)
+    print(json.dumps(output, indent=2))
+    return 0 if transfer_succeeded(output) else 1
 
 
 if __name__ == "__main__":
@@ -4,23 +4,81 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
 import html
 import json
 import mimetypes
 import os
 import pathlib
+import random
 import re
+import sqlite3
+import threading
 import time
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import fastjsonschema
+except ImportError:  # pragma: no cover - optional speedup
+    fastjsonschema = None  # type: ignore[assignment]
 
 
 WAVESPEED_API_BASE = "https://api.wavespeed.ai/api/v3"
 SUCCESS_STATUSES = {"succeeded", "completed", "success"}
 FAIL_STATUSES = {"failed", "error", "canceled", "cancelled"}
+DEFAULT_MAX_CONCURRENCY = 4
+WEBHOOK_WAIT_INTERVAL_SEC = 0.5
+WEBHOOK_FALLBACK_POLL_SEC = 60
+POLL_MAX_DELAY_SEC = 30.0
+# Provider output URLs are not kept forever, so cached task results are only trusted for a day.
+TASK_CACHE_TTL_SEC = 24 * 3600
+OG_IMAGE_PATTERNS = [
+    re.compile(r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']', re.IGNORECASE),
+    re.compile(r'<meta[^>]+content=["\']([^"\']+)["\'][^>]+property=["\']og:image["\']', re.IGNORECASE),
+]
+ENV_FILES_LOADED: Dict[str, int] = {}
+
+PAYLOAD_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "required": ["story_id", "style_reference_images", "character", "generation", "scenes"],
+    "properties": {
+        "style_reference_images": {"type": "array", "minItems": 1},
+        "character": {
+            "type": "object",
+            "required": ["character_model_prompt"],
+            "properties": {"character_model_prompt": {"type": "string"}},
+        },
+        "generation": {"type": "object"},
+        "scenes": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "required": ["image_prompt", "motion_prompt"],
+                "properties": {
+                    "scene_id": {"type": "string"},
+                    "image_prompt": {"type": "string"},
+                    "motion_prompt": {"type": "string"},
+                    "reference_images": {"type": "array", "items": {"type": "string"}},
+                },
+            },
+        },
+    },
+}
+# fastjsonschema generates a specialised validator once at import; without it validate_config checks by hand.
+PAYLOAD_VALIDATOR = fastjsonschema.compile(PAYLOAD_SCHEMA) if fastjsonschema is not None else None
 
 
 class PipelineError(RuntimeError):
@@ -32,8 +90,16 @@ def utc_now_iso() -> str:
 
 
 def load_env_file(path: pathlib.Path) -> None:
-    if not path.exists():
+    # Parents that already exported .env (the dashboard's trigger launch) set APRT_ENV_LOADED.
+    if os.environ.get("APRT_ENV_LOADED"):
         return
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return
+    if ENV_FILES_LOADED.get(str(path)) == mtime_ns:
+        return
+    ENV_FILES_LOADED[str(path)] = mtime_ns
     for raw in path.read_text(encoding="utf-8").splitlines():
         line = raw.strip()
         if not line or line.startswith("#") or "=" not in line:
@@ -49,39 +115,125 @@ def ensure_dir(path: pathlib.Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+def json_bytes(value: Any, indent: bool = False) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else None)
+        except TypeError:
+            pass
+    return json.dumps(value, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def json_loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
 def write_json(path: pathlib.Path, payload: Dict[str, Any]) -> None:
-    path.write_text(json.dumps(payload, indent=2, ensure_ascii=True), encoding="utf-8")
+    # Write beside the target and rename over it so readers never see a torn file. The temp name is
+    # unique per call: concurrent runs share latest_payload.json, and a shared name could be a hard
+    # link to another run's payload file.
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp_path.write_bytes(json_bytes(payload, indent=True))
+    os.replace(tmp_path, path)
+
+
+def link_latest(source: pathlib.Path, latest_path: pathlib.Path, payload: Dict[str, Any]) -> None:
+    # Point latest_payload.json at the run's payload file instead of serializing it a second time.
+    tmp_path = latest_path.with_name(f"{latest_path.name}.{source.stem}.tmp")
+    try:
+        os.link(source, tmp_path)
+        os.replace(tmp_path, latest_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        write_json(latest_path, payload)
+
+
+class CheckpointWriter:
+    """Appends state events to a JSONL log on a background thread, batching whatever is pending."""
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.pending: List[bytes] = []
+        self.scheduled = False
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        self.future: Optional[Future] = None
+
+    def append(self, event: Dict[str, Any]) -> None:
+        # Serialize on the caller's thread so later payload mutations cannot race the write.
+        line = json_bytes(event) + b"\n"
+        with self.lock:
+            self.pending.append(line)
+            if self.scheduled:
+                return
+            self.scheduled = True
+            self.future = self.executor.submit(self.drain)
+
+    def drain(self) -> None:
+        while True:
+            with self.lock:
+                lines = self.pending
+                self.pending = []
+                if not lines:
+                    self.scheduled = False
+                    return
+            try:
+                with self.path.open("ab") as handle:
+                    handle.write(b"".join(lines))
+                    handle.flush()
+                    os.fsync(handle.fileno())
+            except BaseException:
+                # Requeue the batch and let the next append retry it; close() re-raises if nothing succeeds.
+                with self.lock:
+                    self.pending[:0] = lines
+                    self.scheduled = False
+                raise
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        if self.future is not None:
+            self.future.result()
 
 
 def is_url(value: str) -> bool:
     return value.startswith("http://") or value.startswith("https://")
 
 
+@functools.lru_cache(maxsize=256)
+def fetch_reference_image_url(url: str) -> str:
+    # Raises on failure so lru_cache only remembers successful lookups.
+    response = requests.get(
+        url,
+        timeout=20,
+        allow_redirects=True,
+        headers={"User-Agent": "Mozilla/5.0"},
+    )
+    content_type = response.headers.get("Content-Type", "").lower()
+    if content_type.startswith("image/"):
+        return response.url
+    if "text/html" in content_type:
+        text = response.text
+        for pattern in OG_IMAGE_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return html.unescape(match.group(1))
+    return url
+
+
 def maybe_resolve_reference_url(url: str) -> str:
     if "pin.it/" not in url and "pinterest." not in url:
         return url
     try:
-        response = requests.get(
-            url,
-            timeout=20,
-            allow_redirects=True,
-            headers={"User-Agent": "Mozilla/5.0"},
-        )
-        content_type = response.headers.get("Content-Type", "").lower()
-        if content_type.startswith("image/"):
-            return response.url
-        if "text/html" in content_type:
-            patterns = [
-                r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']',
-                r'<meta[^>]+content=["\']([^"\']+)["\'][^>]+property=["\']og:image["\']',
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, response.text, flags=re.IGNORECASE)
-                if match:
-                    return html.unescape(match.group(1))
+        return fetch_reference_image_url(url)
     except Exception:  # noqa: BLE001
         return url
-    return url
+
+
+@functools.lru_cache(maxsize=64)
+def guess_content_type(name: str) -> str:
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
 
 
 def normalize_status(payload: Dict[str, Any]) -> str:
@@ -98,45 +250,64 @@ def normalize_status(payload: Dict[str, Any]) -> str:
 
 
 def collect_urls(value: Any) -> List[str]:
+    # Iterative pre-order walk; children are pushed reversed so URLs keep document order.
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return [item for item in value if is_url(item)]
     urls: List[str] = []
-    if isinstance(value, str):
-        if is_url(value):
-            urls.append(value)
-        return urls
-    if isinstance(value, list):
-        for item in value:
-            urls.extend(collect_urls(item))
-        return urls
-    if isinstance(value, dict):
-        for nested in value.values():
-            urls.extend(collect_urls(nested))
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            if is_url(node):
+                urls.append(node)
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            stack.extend(reversed(list(node.values())))
     return urls
 
 
 def extract_task_id(payload: Dict[str, Any]) -> Optional[str]:
-    for key in ("id", "task_id", "prediction_id"):
-        value = payload.get(key)
-        if isinstance(value, str) and value:
-            return value
-    if isinstance(payload.get("data"), dict):
-        return extract_task_id(payload["data"])
+    node: Any = payload
+    while isinstance(node, dict):
+        for key in ("id", "task_id", "prediction_id"):
+            value = node.get(key)
+            if isinstance(value, str) and value:
+                return value
+        node = node.get("data")
     return None
 
 
 def extract_error_message(payload: Dict[str, Any]) -> str:
-    for key in ("error", "message", "detail"):
-        value = payload.get(key)
-        if isinstance(value, str) and value.strip():
-            return value.strip()
-        if isinstance(value, dict):
-            text = extract_error_message(value)
-            if text:
-                return text
-    if isinstance(payload.get("data"), dict):
-        return extract_error_message(payload["data"])
+    # Follows the first nested error/message/detail dict (else "data") down one chain; no recursion.
+    node: Any = payload
+    while isinstance(node, dict):
+        next_node = None
+        for key in ("error", "message", "detail"):
+            value = node.get(key)
+            if isinstance(value, str) and value.strip():
+                return value.strip()
+            if isinstance(value, dict):
+                next_node = value
+                break
+        if next_node is None:
+            next_node = node.get("data")
+        node = next_node
     return "Unknown provider error"
 
 
+def webhook_spool_path(task_id: str) -> pathlib.Path:
+    # webhook_listener.py drops provider callbacks here; the pipeline waits on the file instead of polling.
+    root = os.getenv("WAVESPEED_WEBHOOK_SPOOL_DIR") or str(pathlib.Path(__file__).resolve().parents[1] / ".tmp" / "wavespeed_webhooks")
+    safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", task_id)
+    return pathlib.Path(root).expanduser() / f"{safe_id}.json"
+
+
+def default_task_cache_path() -> pathlib.Path:
+    root = os.getenv("WAVESPEED_TASK_CACHE_PATH") or str(pathlib.Path(__file__).resolve().parents[1] / ".tmp" / "wavespeed_task_cache.sqlite3")
+    return pathlib.Path(root).expanduser()
+
+
 def choose_primary_url(urls: List[str], kind: str) -> str:
     if not urls:
         raise PipelineError(f"No output URL returned for {kind}.")
@@ -154,15 +325,27 @@ def choose_primary_url(urls: List[str], kind: str) -> str:
 
 
 class WaveSpeedClient:
-    def __init__(self, api_key: str, timeout_sec: int = 90) -> None:
+    def __init__(self, api_key: str, timeout_sec: int = 90, cache_path: Optional[pathlib.Path] = None) -> None:
         self.api_key = api_key
         self.timeout_sec = timeout_sec
+        self.cache: Optional[sqlite3.Connection] = None
+        self.cache_lock = threading.Lock()
+        if cache_path is not None:
+            ensure_dir(cache_path.parent)
+            self.cache = sqlite3.connect(str(cache_path), check_same_thread=False)
+            self.cache.execute(
+                "CREATE TABLE IF NOT EXISTS tasks (key TEXT PRIMARY KEY, model TEXT, task_id TEXT, result_json TEXT, ts REAL)"
+            )
+            self.cache.execute("CREATE TABLE IF NOT EXISTS uploads (digest TEXT PRIMARY KEY, url TEXT, ts REAL)")
+            self.cache.commit()
+        # One keep-alive pool shared by every scene worker, so polls reuse the TLS connection.
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=16))
+        self.session.headers["Authorization"] = f"Bearer {api_key}"
+        self.webhook_url = os.getenv("WAVESPEED_WEBHOOK_URL", "").strip()
 
     def _headers(self) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+        return {"Content-Type": "application/json"}
 
     def submit_task(self, model_path: str, input_payload: Dict[str, Any]) -> Dict[str, Any]:
         endpoint = f"{WAVESPEED_API_BASE}/{model_path}"
@@ -170,7 +353,14 @@ class WaveSpeedClient:
             "enable_base64_output": False,
             "input": input_payload,
         }
-        response = requests.post(endpoint, headers=self._headers(), json=body, timeout=self.timeout_sec)
+        params = {"webhook": self.webhook_url} if self.webhook_url else None
+        response = self.session.post(
+            endpoint,
+            headers=self._headers(),
+            params=params,
+            json=body,
+            timeout=self.timeout_sec,
+        )
         response.raise_for_status()
         payload = response.json()
         task_id = extract_task_id(payload)
@@ -178,13 +368,21 @@ class WaveSpeedClient:
             raise PipelineError(f"WaveSpeed did not return task id for {model_path}: {payload}")
         return payload
 
-    def poll_task(self, task_id: str, poll_interval_sec: int, timeout_sec: int) -> Dict[str, Any]:
+    def fetch_task(self, task_id: str) -> Dict[str, Any]:
         endpoint = f"{WAVESPEED_API_BASE}/predictions/{task_id}"
+        response = self.session.get(endpoint, timeout=self.timeout_sec)
+        response.raise_for_status()
+        return response.json()
+
+    def poll_task(self, task_id: str, poll_interval_sec: int, timeout_sec: int) -> Dict[str, Any]:
+        if self.webhook_url:
+            return self.wait_for_webhook(task_id, timeout_sec)
         started = time.time()
+        base_delay = float(max(1, poll_interval_sec))
+        delay = base_delay
+        last_status = None
         while True:
-            response = requests.get(endpoint, headers={"Authorization": f"Bearer {self.api_key}"}, timeout=self.timeout_sec)
-            response.raise_for_status()
-            payload = response.json()
+            payload = self.fetch_task(task_id)
             status = normalize_status(payload)
             if status in SUCCESS_STATUSES:
                 return payload
@@ -192,30 +390,169 @@ class WaveSpeedClient:
                 raise PipelineError(f"WaveSpeed task {task_id} failed: {extract_error_message(payload)}")
             if time.time() - started > timeout_sec:
                 raise PipelineError(f"Polling timeout for task {task_id} after {timeout_sec}s.")
-            time.sleep(max(1, poll_interval_sec))
+            # Back off on long jobs, but repoll quickly again whenever the provider status moves.
+            if status != last_status:
+                delay = base_delay
+                last_status = status
+            time.sleep(delay + random.uniform(0, delay * 0.1))
+            delay = min(delay * 1.5, max(base_delay, POLL_MAX_DELAY_SEC))
+
+    def wait_for_webhook(self, task_id: str, timeout_sec: int) -> Dict[str, Any]:
+        # Callbacks land as spool files; an occasional GET covers a callback that never arrives.
+        spool_path = webhook_spool_path(task_id)
+        started = time.time()
+        last_fetch = started
+        spool_mtime_ns: Optional[int] = None
+        payload: Optional[Dict[str, Any]] = None
+        while True:
+            # Re-read the spool file only when the listener has replaced it.
+            try:
+                mtime_ns = spool_path.stat().st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            spooled = False
+            if mtime_ns is not None and mtime_ns != spool_mtime_ns:
+                spool_mtime_ns = mtime_ns
+                try:
+                    payload = json_loads(spool_path.read_bytes())
+                    spooled = True
+                except (OSError, ValueError):
+                    spool_mtime_ns = None
+            status = normalize_status(payload) if isinstance(payload, dict) else "unknown"
+            # Queued/processing callbacks do not disable the fallback; a lost final callback still gets polled.
+            terminal = status in SUCCESS_STATUSES or status in FAIL_STATUSES
+            if spooled and terminal:
+                # Callbacks are unsigned when no webhook secret is set, so a terminal result is only
+                # trusted (and cached) once the provider confirms it.
+                last_fetch = time.time()
+                payload = self.fetch_task(task_id)
+                status = normalize_status(payload)
+            elif not terminal and time.time() - last_fetch >= WEBHOOK_FALLBACK_POLL_SEC:
+                last_fetch = time.time()
+                payload = self.fetch_task(task_id)
+                status = normalize_status(payload)
+            if status in SUCCESS_STATUSES or status in FAIL_STATUSES:
+                spool_path.unlink(missing_ok=True)
+                if status in FAIL_STATUSES:
+                    raise PipelineError(f"WaveSpeed task {task_id} failed: {extract_error_message(payload)}")
+                return payload  # type: ignore[return-value]
+            if time.time() - started > timeout_sec:
+                raise PipelineError(f"Webhook wait timeout for task {task_id} after {timeout_sec}s.")
+            time.sleep(WEBHOOK_WAIT_INTERVAL_SEC)
+
+    def task_cache_key(self, model_path: str, input_payload: Dict[str, Any]) -> str:
+        canonical = json.dumps(input_payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+        return hashlib.blake2b(f"{model_path}\n{canonical}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def cached_task(self, key: str) -> Optional[Tuple[str, Optional[str]]]:
+        if self.cache is None:
+            return None
+        with self.cache_lock:
+            row = self.cache.execute(
+                "SELECT task_id, result_json FROM tasks WHERE key = ? AND ts >= ?",
+                (key, time.time() - TASK_CACHE_TTL_SEC),
+            ).fetchone()
+        return row
+
+    def store_task(self, key: str, model_path: str, task_id: Optional[str], result: Optional[Dict[str, Any]]) -> None:
+        if self.cache is None:
+            return
+        with self.cache_lock:
+            if task_id is None:
+                self.cache.execute("DELETE FROM tasks WHERE key = ?", (key,))
+            else:
+                result_json = json_bytes(result).decode("utf-8") if result is not None else None
+                self.cache.execute(
+                    "INSERT OR REPLACE INTO tasks (key, model, task_id, result_json, ts) VALUES (?, ?, ?, ?, ?)",
+                    (key, model_path, task_id, result_json, time.time()),
+                )
+            self.cache.commit()
+
+    def run_task(
+        self,
+        model_path: str,
+        input_payload: Dict[str, Any],
+        poll_interval_sec: int,
+        timeout_sec: int,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Submit and wait for a task, reusing an identical earlier submission from the local cache."""
+        key = self.task_cache_key(model_path, input_payload)
+        cached = self.cached_task(key)
+        if cached and cached[1]:
+            return cached[0], json_loads(cached[1].encode("utf-8"))
+        if cached:
+            # Submitted by an earlier run that never saw the result: wait on it instead of paying again.
+            task_id = cached[0]
+            try:
+                result = self.poll_task(task_id, poll_interval_sec, timeout_sec)
+            except Exception:  # noqa: BLE001
+                # Expired, unknown or failed id: forget it and fall through to a fresh submission.
+                self.store_task(key, model_path, None, None)
+            else:
+                self.store_task(key, model_path, task_id, result)
+                return task_id, result
+        task_id = extract_task_id(self.submit_task(model_path, input_payload)) or ""
+        self.store_task(key, model_path, task_id, None)
+        try:
+            result = self.poll_task(task_id, poll_interval_sec, timeout_sec)
+        except PipelineError:
+            self.store_task(key, model_path, None, None)
+            raise
+        except requests.HTTPError as exc:
+            # 4xx means the provider will never answer for this id; transient 5xx keeps it resumable.
+            status_code = exc.response.status_code if exc.response is not None else 0
+            if 400 <= status_code < 500:
+                self.store_task(key, model_path, None, None)
+            raise
+        self.store_task(key, model_path, task_id, result)
+        return task_id, result
 
     def upload_local_file(self, path: pathlib.Path) -> str:
+        # Content-addressed: the same reference file is uploaded once, then reused from the cache.
+        digest = None
+        if self.cache is not None:
+            hasher = hashlib.blake2b(digest_size=16)
+            with path.open("rb") as handle:
+                for chunk in iter(lambda: handle.read(1 << 20), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            with self.cache_lock:
+                row = self.cache.execute(
+                    "SELECT url FROM uploads WHERE digest = ? AND ts >= ?",
+                    (digest, time.time() - TASK_CACHE_TTL_SEC),
+                ).fetchone()
+            if row:
+                return row[0]
+        url = self.upload_file_bytes(path)
+        if digest is not None and self.cache is not None:
+            with self.cache_lock:
+                self.cache.execute(
+                    "INSERT OR REPLACE INTO uploads (digest, url, ts) VALUES (?, ?, ?)",
+                    (digest, url, time.time()),
+                )
+                self.cache.commit()
+        return url
+
+    def upload_file_bytes(self, path: pathlib.Path) -> str:
         endpoint = f"{WAVESPEED_API_BASE}/media/upload/binary"
-        content_type = mimetypes.guess_type(str(path))[0] or "application/octet-stream"
-        raw = path.read_bytes()
+        content_type = guess_content_type(path.name)
 
         # WaveSpeed binary upload can be raw bytes. If provider rejects, retry as multipart.
-        response = requests.post(
-            endpoint,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": content_type,
-            },
-            data=raw,
-            timeout=self.timeout_sec,
-        )
-        if not response.ok:
-            response = requests.post(
+        # The open file is streamed in chunks rather than read into memory first.
+        with path.open("rb") as handle:
+            response = self.session.post(
                 endpoint,
-                headers={"Authorization": f"Bearer {self.api_key}"},
-                files={"file": (path.name, raw, content_type)},
+                headers={"Content-Type": content_type},
+                data=handle,
                 timeout=self.timeout_sec,
             )
+            if not response.ok:
+                handle.seek(0)
+                response = self.session.post(
+                    endpoint,
+                    files={"file": (path.name, handle, content_type)},
+                    timeout=self.timeout_sec,
+                )
         response.raise_for_status()
         payload = response.json()
         urls = collect_urls(payload)
@@ -225,6 +562,14 @@ class WaveSpeedClient:
 
 
 def validate_config(config: Dict[str, Any]) -> None:
+    if PAYLOAD_VALIDATOR is not None:
+        try:
+            PAYLOAD_VALIDATOR(config)
+        except fastjsonschema.JsonSchemaException as exc:
+            raise PipelineError(f"Invalid payload config: {exc.message}") from exc
+        return
+    if not isinstance(config, dict):
+        raise PipelineError("Payload config must be a JSON object.")
     required_top = ["story_id", "style_reference_images", "character", "generation", "scenes"]
     for key in required_top:
         if key not in config:
@@ -233,6 +578,21 @@ def validate_config(config: Dict[str, Any]) -> None:
         raise PipelineError("Payload config must include at least one scene.")
     if not isinstance(config["style_reference_images"], list) or not config["style_reference_images"]:
         raise PipelineError("At least one style reference image is required.")
+    if not isinstance(config["character"], dict) or not isinstance(config["character"].get("character_model_prompt"), str):
+        raise PipelineError("character.character_model_prompt must be a string.")
+    if not isinstance(config["generation"], dict):
+        raise PipelineError("generation must be an object.")
+    for idx, scene in enumerate(config["scenes"]):
+        if not isinstance(scene, dict):
+            raise PipelineError(f"Scene {idx} must be an object.")
+        for key in ("image_prompt", "motion_prompt"):
+            if not isinstance(scene.get(key), str):
+                raise PipelineError(f"Scene {idx} is missing string '{key}'.")
+        if "scene_id" in scene and not isinstance(scene["scene_id"], str):
+            raise PipelineError(f"Scene {idx} scene_id must be a string.")
+        refs = scene.get("reference_images", [])
+        if not isinstance(refs, list) or not all(isinstance(ref, str) for ref in refs):
+            raise PipelineError(f"Scene {idx} reference_images must be a list of strings.")
 
 
 def resolve_reference_images(
@@ -240,29 +600,40 @@ def resolve_reference_images(
     client: Optional[WaveSpeedClient],
     dry_run: bool,
 ) -> List[str]:
-    resolved: List[str] = []
-    for idx, ref in enumerate(refs):
+    def resolve_one(idx: int, ref: Any) -> Optional[str]:
         if not isinstance(ref, str) or not ref.strip():
-            continue
+            return None
         ref = ref.strip()
         if is_url(ref):
-            resolved.append(maybe_resolve_reference_url(ref))
-            continue
+            return maybe_resolve_reference_url(ref)
         path = pathlib.Path(ref).expanduser().resolve()
         if not path.exists():
             raise PipelineError(f"Reference image path does not exist: {path}")
         if dry_run:
-            resolved.append(f"https://dry-run.local/reference/{idx}-{path.name}")
-            continue
+            return f"https://dry-run.local/reference/{idx}-{path.name}"
         if client is None:
             raise PipelineError("WaveSpeed client unavailable for local file upload.")
-        resolved.append(client.upload_local_file(path))
+        return client.upload_local_file(path)
+
+    # Pinterest fetches and uploads are independent round-trips; run them side by side, keeping ref order.
+    if len(refs) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(refs))) as executor:
+            results = list(executor.map(resolve_one, range(len(refs)), refs))
+    else:
+        results = [resolve_one(idx, ref) for idx, ref in enumerate(refs)]
+    resolved = [url for url in results if url]
     if not resolved:
         raise PipelineError("No valid style reference image URLs were resolved.")
     return resolved
 
 
-def run_pipeline(config: Dict[str, Any], out_dir: pathlib.Path, dry_run: bool) -> Dict[str, Any]:
+def run_pipeline(
+    config: Dict[str, Any],
+    out_dir: pathlib.Path,
+    dry_run: bool,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
     validate_config(config)
     run_id = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:8]}"
     started_at = utc_now_iso()
@@ -274,12 +645,14 @@ def run_pipeline(config: Dict[str, Any], out_dir: pathlib.Path, dry_run: bool) -
     video_model = generation.get("video_model", "wavespeed-ai/wan-2.2/image-to-video")
 
     api_key = os.getenv("WAVESPEED_API_KEY", "")
-    client = None if dry_run else WaveSpeedClient(api_key=api_key)
+    client = None
+    if not dry_run:
+        client = WaveSpeedClient(api_key=api_key, cache_path=default_task_cache_path() if use_cache else None)
     if not dry_run and not api_key:
         raise PipelineError("WAVESPEED_API_KEY is required for live generation.")
 
     ensure_dir(out_dir)
-    state_path = out_dir / f"state_{run_id}.json"
+    state_path = out_dir / f"state_{run_id}.jsonl"
 
     payload: Dict[str, Any] = {
         "story_id": config.get("story_id"),
@@ -305,13 +678,26 @@ def run_pipeline(config: Dict[str, Any], out_dir: pathlib.Path, dry_run: bool) -
             voiceover_path = pathlib.Path.cwd() / voiceover_path
         if not voiceover_path.exists():
             raise PipelineError(f"voiceover_script_path does not exist: {voiceover_path}")
+        # Reference the script by path + digest; consumers that need the text read the file themselves.
+        digest = hashlib.sha256()
+        size = 0
+        with voiceover_path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(chunk)
+                size += len(chunk)
         payload["source_script"] = {
             "path": str(voiceover_path.resolve()),
-            "text": voiceover_path.read_text(encoding="utf-8"),
+            "sha256": digest.hexdigest(),
+            "size": size,
         }
 
-    def checkpoint() -> None:
-        write_json(state_path, payload)
+    # state_<run_id>.jsonl only records what changed; payload_<run_id>.json holds the full result.
+    checkpoint_writer = CheckpointWriter(state_path)
+
+    def checkpoint(event: str, **fields: Any) -> None:
+        checkpoint_writer.append({"event": event, "at": utc_now_iso(), **fields})
+
+    checkpoint("started", story_id=payload["story_id"], run_id=run_id, started_at=started_at)
 
     try:
         style_refs = resolve_reference_images(config["style_reference_images"], client=client, dry_run=dry_run)
@@ -327,9 +713,9 @@ def run_pipeline(config: Dict[str, Any], out_dir: pathlib.Path, dry_run: bool) -
                 "resolution": generation.get("image_resolution", "1k"),
                 "output_format": generation.get("image_output_format", "png"),
             }
-            character_submit = client.submit_task(image_model, character_input)  # type: ignore[union-attr]
-            character_task_id = extract_task_id(character_submit) or ""
-            character_result = client.poll_task(character_task_id, poll_interval, poll_timeout)  # type: ignore[union-attr]
+            character_task_id, character_result = client.run_task(  # type: ignore[union-attr]
+                image_model, character_input, poll_interval, poll_timeout
+            )
             character_urls = collect_urls(character_result.get("output", character_result))
             character_url = choose_primary_url(character_urls, kind="image")
 
@@ -339,12 +725,15 @@ def run_pipeline(config: Dict[str, Any], out_dir: pathlib.Path, dry_run: bool) -
             "image_url": character_url,
             "consistency_notes": config["character"].get("consistency_notes", ""),
         }
-        checkpoint()
+        checkpoint("character_model", character_model=payload["character_model"])
 
-        for idx, scene in enumerate(config["scenes"]):
+        def generate_scene(idx: int, scene: Dict[str, Any]) -> Dict[str, Any]:
             scene_id = scene.get("scene_id", f"scene_{idx + 1:02d}")
             scene_refs = list(style_refs) + [character_url]
             extra_refs = scene.get("reference_images", [])
+            if isinstance(extra_refs, list):
+                # Style refs are already resolved above; only resolve what the scene adds on top.
+                extra_refs = [ref for ref in extra_refs if ref not in config["style_reference_images"]]
             if isinstance(extra_refs, list) and extra_refs:
                 scene_refs.extend(resolve_reference_images(extra_refs, client=client, dry_run=dry_run))
 
@@ -360,9 +749,9 @@ def run_pipeline(config: Dict[str, Any], out_dir: pathlib.Path, dry_run: bool) -
                     "resolution": generation.get("image_resolution", "1k"),
                     "output_format": generation.get("image_output_format", "png"),
                 }
-                image_submit = client.submit_task(image_model, image_input)  # type: ignore[union-attr]
-                image_task_id = extract_task_id(image_submit) or ""
-                image_result = client.poll_task(image_task_id, poll_interval, poll_timeout)  # type: ignore[union-attr]
+                image_task_id, image_result = client.run_task(  # type: ignore[union-attr]
+                    image_model, image_input, poll_interval, poll_timeout
+                )
                 image_urls = collect_urls(image_result.get("output", image_result))
                 image_url = choose_primary_url(image_urls, kind="image")
 
@@ -375,49 +764,65 @@ def run_pipeline(config: Dict[str, Any], out_dir: pathlib.Path, dry_run: bool) -
                     "generate_audio": bool(generation.get("generate_audio", True)),
                     "bgm": bool(generation.get("bgm", True)),
                 }
-                video_submit = client.submit_task(video_model, video_input)  # type: ignore[union-attr]
-                video_task_id = extract_task_id(video_submit) or ""
-                video_result = client.poll_task(video_task_id, poll_interval, poll_timeout)  # type: ignore[union-attr]
+                video_task_id, video_result = client.run_task(  # type: ignore[union-attr]
+                    video_model, video_input, poll_interval, poll_timeout
+                )
                 video_urls = collect_urls(video_result.get("output", video_result))
                 video_url = choose_primary_url(video_urls, kind="video")
 
-            payload["scenes"].append(
-                {
-                    "scene_id": scene_id,
-                    "narration": scene.get("narration", ""),
-                    "image": {
-                        "task_id": image_task_id,
-                        "status": "succeeded",
-                        "url": image_url,
-                    },
-                    "video": {
-                        "task_id": video_task_id,
-                        "status": "succeeded",
-                        "url": video_url,
-                    },
-                }
-            )
-            checkpoint()
+            return {
+                "scene_id": scene_id,
+                "narration": scene.get("narration", ""),
+                "image": {
+                    "task_id": image_task_id,
+                    "status": "succeeded",
+                    "url": image_url,
+                },
+                "video": {
+                    "task_id": video_task_id,
+                    "status": "succeeded",
+                    "url": video_url,
+                },
+            }
+
+        # Scenes only share the immutable style refs and character URL, so they run side by side.
+        # Results are checkpointed from this thread as each one lands; payload keeps scene order.
+        scenes = config["scenes"]
+        scene_results: List[Optional[Dict[str, Any]]] = [None] * len(scenes)
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(scenes))))
+        try:
+            futures = {executor.submit(generate_scene, idx, scene): idx for idx, scene in enumerate(scenes)}
+            for future in as_completed(futures):
+                scene_result = future.result()
+                scene_results[futures[future]] = scene_result
+                payload["scenes"] = [item for item in scene_results if item is not None]
+                checkpoint("scene", scene=scene_result)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
         payload["status"] = "completed"
     except Exception as exc:  # noqa: BLE001
         payload["status"] = "failed"
         payload["errors"].append({"stage": "pipeline", "message": str(exc)})
-        checkpoint()
         raise
     finally:
+        # One terminal event per run; on failure it carries the errors instead of a separate line.
         payload["run"]["ended_at"] = utc_now_iso()
-        checkpoint()
+        ended = {"status": payload["status"], "ended_at": payload["run"]["ended_at"]}
+        if payload["status"] == "failed":
+            ended["errors"] = payload["errors"]
+        checkpoint("ended", **ended)
+        checkpoint_writer.close()
 
     final_path = out_dir / f"payload_{run_id}.json"
     latest_path = out_dir / "latest_payload.json"
     write_json(final_path, payload)
-    write_json(latest_path, payload)
+    link_latest(final_path, latest_path, payload)
     payload["local_output_path"] = str(final_path)
     return payload
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run APRT Script 3 WaveSpeed story pipeline.")
     parser.add_argument(
         "--input",
@@ -434,31 +839,47 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Run without live API calls; emits simulated output URLs.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help="Maximum scenes generated at once (keeps WaveSpeed request volume bounded).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always submit new WaveSpeed tasks instead of reusing identical cached ones.",
+    )
+    return parser.parse_args(argv)
 
 
-def main() -> int:
-    args = parse_args()
-    cwd = pathlib.Path.cwd()
-    load_env_file(cwd / ".env")
-
+def run(args: argparse.Namespace) -> Dict[str, Any]:
     input_path = pathlib.Path(args.input).expanduser().resolve()
     out_dir = pathlib.Path(args.out_dir).expanduser().resolve()
 
     if not input_path.exists():
         raise SystemExit(f"Input payload file does not exist: {input_path}")
 
-    config = json.loads(input_path.read_text(encoding="utf-8"))
-    result = run_pipeline(config=config, out_dir=out_dir, dry_run=bool(args.dry_run))
-    print(json.dumps(
-        {
-            "status": result["status"],
-            "run_id": result["run_id"],
-            "output_path": result.get("local_output_path", str(out_dir / "latest_payload.json")),
-            "scene_count": len(result.get("scenes", [])),
-        },
-        indent=2,
-    ))
+    config = json_loads(input_path.read_bytes())
+    result = run_pipeline(
+        config=config,
+        out_dir=out_dir,
+        dry_run=bool(args.dry_run),
+        max_concurrency=args.max_concurrency,
+        use_cache=not args.no_cache,
+    )
+    return {
+        "status": result["status"],
+        "run_id": result["run_id"],
+        "output_path": result.get("local_output_path", str(out_dir / "latest_payload.json")),
+        "scene_count": len(result.get("scenes", [])),
+    }
+
+
+def main() -> int:
+    args = parse_args()
+    load_env_file(pathlib.Path.cwd() / ".env")
+    print(json.dumps(run(args), indent=2))
     return 0
 
 
@@ -4,16 +4,37 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import functools
 import hashlib
 import hmac
-import json
+import multiprocessing
 import os
 import pathlib
-import subprocess
+import signal
+import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Optional
 
+import run_phase5_trigger
+from wavespeed_story_pipeline import extract_task_id, json_bytes, json_loads, normalize_status, webhook_spool_path
+
+
+# Signature checks hash every callback body; the OpenSSL-backed sha256 uses SHA-NI / ARMv8 crypto extensions.
+HASHLIB_OPENSSL = getattr(hashlib.sha256, "__module__", "") == "_hashlib"
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+DEFAULT_TRIGGER_WORKERS = 4
+DEFAULT_HTTP_THREADS = 16
+# Provider callbacks are small JSON documents; refuse anything larger before allocating for it.
+MAX_BODY_BYTES = 4 * 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+# Pooled handler threads are shared, so an idle or trickling client must not hold one indefinitely.
+HANDLER_SOCKET_TIMEOUT_SEC = 15
+TRIGGER_POOL: Optional[ProcessPoolExecutor] = None
+
 
 def load_env_file(path: pathlib.Path) -> None:
     if not path.exists():
@@ -29,10 +50,20 @@ def load_env_file(path: pathlib.Path) -> None:
             os.environ[key] = value
 
 
-def verify_signature(raw_body: bytes, webhook_id: str, ts: str, signature_header: str, secret: str) -> bool:
+@functools.lru_cache(maxsize=4)
+def signing_hmac(secret: str) -> "hmac.HMAC":
+    # Keyed once per secret; each request clones the prepared inner/outer state.
     clean_secret = secret.replace("whsec_", "", 1)
-    signed_payload = f"{webhook_id}.{ts}.".encode("utf-8") + raw_body
-    computed = hmac.new(clean_secret.encode("utf-8"), signed_payload, hashlib.sha256).hexdigest()
+    return hmac.new(clean_secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+
+def signature_mac(secret: str, webhook_id: str, ts: str) -> "hmac.HMAC":
+    mac = signing_hmac(secret).copy()
+    mac.update(f"{webhook_id}.{ts}.".encode("utf-8"))
+    return mac
+
+
+def signature_matches(computed: str, signature_header: str) -> bool:
     # Accept either raw signature value or provider-formatted pairs.
     provided_candidates = [part.strip() for part in signature_header.split(",") if part.strip()]
     if signature_header.startswith("v1="):
@@ -40,9 +71,37 @@ def verify_signature(raw_body: bytes, webhook_id: str, ts: str, signature_header
     return any(hmac.compare_digest(computed, item) for item in provided_candidates)
 
 
+def verify_signature(raw_body: bytes, webhook_id: str, ts: str, signature_header: str, secret: str) -> bool:
+    mac = signature_mac(secret, webhook_id, ts)
+    mac.update(raw_body)
+    return signature_matches(mac.hexdigest(), signature_header)
+
+
+def run_trigger(dry_run: bool) -> int:
+    # Runs inside a warm pool worker (cwd=ROOT); status tracking goes to .tmp/logs by the trigger script.
+    argv = ["--dry-run"] if dry_run else []
+    with open(os.devnull, "w", encoding="utf-8") as sink, contextlib.redirect_stdout(sink):
+        return run_phase5_trigger.main(argv)
+
+
+def trigger_pool(max_workers: int = DEFAULT_TRIGGER_WORKERS) -> ProcessPoolExecutor:
+    global TRIGGER_POOL
+    if TRIGGER_POOL is None:
+        # spawn, not fork: the listener is multi-threaded, and workers stay alive across webhooks.
+        TRIGGER_POOL = ProcessPoolExecutor(
+            max_workers=max(1, max_workers),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=os.chdir,
+            initargs=(str(ROOT),),
+        )
+    return TRIGGER_POOL
+
+
 class Handler(BaseHTTPRequestHandler):
+    timeout = HANDLER_SOCKET_TIMEOUT_SEC
+
     def _respond(self, code: int, payload: dict) -> None:
-        raw = json.dumps(payload, ensure_ascii=True).encode("utf-8")
+        raw = json_bytes(payload)
         self.send_response(code)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(raw)))
@@ -54,9 +113,19 @@ class Handler(BaseHTTPRequestHandler):
             self._respond(HTTPStatus.NOT_FOUND, {"ok": False, "error": "unknown path"})
             return
 
-        length = int(self.headers.get("Content-Length", "0"))
-        raw_body = self.rfile.read(length)
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._respond(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "invalid content-length"})
+            return
+        if length > MAX_BODY_BYTES:
+            self._respond(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"ok": False, "error": "body too large"})
+            return
+
         secret = os.getenv("WAVESPEED_WEBHOOK_SECRET", "")
+        mac = None
         if secret:
             webhook_id = self.headers.get("webhook-id", "")
             webhook_ts = self.headers.get("webhook-timestamp", "")
@@ -64,23 +133,54 @@ class Handler(BaseHTTPRequestHandler):
             if not webhook_id or not webhook_ts or not signature:
                 self._respond(HTTPStatus.UNAUTHORIZED, {"ok": False, "error": "missing webhook signature headers"})
                 return
-            if not verify_signature(raw_body, webhook_id, webhook_ts, signature, secret):
-                self._respond(HTTPStatus.UNAUTHORIZED, {"ok": False, "error": "invalid webhook signature"})
-                return
+            mac = signature_mac(secret, webhook_id, webhook_ts)
+
+        # Read into one preallocated buffer, hashing each chunk as it arrives.
+        raw_body = bytearray(length)
+        view = memoryview(raw_body)
+        pos = 0
+        while pos < length:
+            try:
+                count = self.rfile.readinto(view[pos : min(length, pos + READ_CHUNK_BYTES)])
+            except TimeoutError:
+                count = 0
+            if not count:
+                break
+            if mac is not None:
+                mac.update(view[pos : pos + count])
+            pos += count
+        view.release()
+        if pos < length:
+            self._respond(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "incomplete body"})
+            return
+        if mac is not None and not signature_matches(mac.hexdigest(), signature):
+            self._respond(HTTPStatus.UNAUTHORIZED, {"ok": False, "error": "invalid webhook signature"})
+            return
 
         try:
-            event = json.loads(raw_body.decode("utf-8")) if raw_body else {}
-        except json.JSONDecodeError:
+            event = json_loads(raw_body) if raw_body else {}
+        except ValueError:
             self._respond(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "invalid json"})
             return
 
+        # Provider task callbacks feed the running pipeline's wait instead of starting a new run.
+        task_id = extract_task_id(event) if self.path == "/wavespeed/webhook" and isinstance(event, dict) else None
+        if task_id:
+            spool_path = webhook_spool_path(task_id)
+            spool_path.parent.mkdir(parents=True, exist_ok=True)
+            # Unique temp name so duplicate callbacks for one task never share (and race on) a temp file.
+            tmp_path = spool_path.with_name(f"{spool_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+            tmp_path.write_bytes(raw_body)
+            os.replace(tmp_path, spool_path)
+            self._respond(
+                HTTPStatus.OK,
+                {"ok": True, "status": "recorded", "task_id": task_id, "task_status": normalize_status(event)},
+            )
+            return
+
         trigger_type = event.get("event") or event.get("type") or "manual_webhook"
-        root = pathlib.Path(__file__).resolve().parents[1]
-        cmd = [os.environ.get("PYTHON", "python3"), "tools/run_phase5_trigger.py"]
-        if event.get("dry_run", False):
-            cmd.append("--dry-run")
-        # Fire-and-forget trigger. Status tracking goes to .tmp/logs by trigger script.
-        subprocess.Popen(cmd, cwd=str(root), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # Fire-and-forget trigger on a pre-imported worker instead of a fresh interpreter per webhook.
+        trigger_pool().submit(run_trigger, bool(event.get("dry_run", False)))
 
         self._respond(
             HTTPStatus.ACCEPTED,
@@ -102,19 +202,59 @@ class Handler(BaseHTTPRequestHandler):
         return
 
 
+class PooledHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that reuses a fixed pool of handler threads instead of one new thread per connection."""
+
+    def __init__(self, server_address: tuple, handler_class: type, max_threads: int = DEFAULT_HTTP_THREADS) -> None:
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, max_threads), thread_name_prefix="webhook-http")
+
+    def process_request(self, request, client_address) -> None:  # type: ignore[no-untyped-def]
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run local webhook listener for Phase 5 triggers.")
     parser.add_argument("--host", default="0.0.0.0")
     parser.add_argument("--port", default=8787, type=int)
+    parser.add_argument(
+        "--trigger-workers",
+        default=DEFAULT_TRIGGER_WORKERS,
+        type=int,
+        help="Worker processes kept warm for webhook-started Phase 5 runs.",
+    )
+    parser.add_argument(
+        "--http-threads",
+        default=DEFAULT_HTTP_THREADS,
+        type=int,
+        help="Handler threads reused across incoming webhook connections.",
+    )
     return parser.parse_args()
 
 
 def main() -> int:
     args = parse_args()
     load_env_file(pathlib.Path(".env").resolve())
-    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    if not HASHLIB_OPENSSL:
+        print(
+            "Warning: hashlib is not backed by OpenSSL; webhook signature checks will be slow. "
+            "Use a Python build linked against OpenSSL 1.1.1+.",
+            file=sys.stderr,
+        )
+    pool = trigger_pool(args.trigger_workers)
+    server = PooledHTTPServer((args.host, args.port), Handler, max_threads=args.http_threads)
+    # SIGTERM unwinds like Ctrl-C so the warm trigger workers are shut down with the listener.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
     print(f"Webhook listener running on http://{args.host}:{args.port}")
-    server.serve_forever()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        pool.shutdown(wait=False, cancel_futures=True)
     return 0
 
 